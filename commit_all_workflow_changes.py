@@ -4,6 +4,7 @@ Script para fazer commit e push das mudanças de workflow em todos os repositór
 """
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Lista de repositórios das Cloud Functions
@@ -23,6 +24,9 @@ REPOS = [
 
 BASE_DIR = Path("/Users/spacejao")
 
+# git add/commit/push são limitados por I/O; processa vários repositórios ao mesmo tempo
+MAX_WORKERS = 8
+
 COMMIT_MSG = """chore: add cache clear step to always fetch latest equidade-data-package
 
 Forces rebuild of dependencies to ensure latest version of equidade-data-package
@@ -48,26 +52,28 @@ def run_git_command(repo_dir: Path, command: list) -> tuple[bool, str]:
         return False, str(e)
 
 
-def has_changes(repo_dir: Path) -> bool:
-    """Verifica se há mudanças no workflow."""
+def has_changes(repo_dir: Path) -> tuple[bool, str]:
+    """Verifica se há mudanças no workflow. Retorna (há mudanças, mensagem de erro)."""
     success, output = run_git_command(
         repo_dir,
-        ["git", "diff", "--quiet", ".github/workflows/deploy.yaml"]
+        ["git", "status", "--porcelain=v1", "--", ".github/workflows/deploy.yaml"]
     )
-    # git diff --quiet retorna 1 se há diferenças, 0 se não há
-    return not success
+    if not success:
+        return False, f"   ❌ Erro ao verificar mudanças: {output}"
+    # Saída vazia = sem mudanças; qualquer linha indica arquivo modificado,
+    # staged ou não rastreado
+    return bool(output.strip()), ""
 
 
-def commit_and_push(repo_dir: Path, repo_name: str) -> bool:
-    """Faz commit e push das mudanças."""
+def commit_and_push(repo_dir: Path, repo_name: str) -> tuple[bool, str]:
+    """Faz commit e push das mudanças. Retorna (sucesso, mensagem de erro)."""
     # Add
     success, output = run_git_command(
         repo_dir,
         ["git", "add", ".github/workflows/deploy.yaml"]
     )
     if not success:
-        print(f"   ❌ Erro ao fazer git add: {output}")
-        return False
+        return False, f"   ❌ Erro ao fazer git add: {output}"
 
     # Commit
     success, output = run_git_command(
@@ -75,8 +81,7 @@ def commit_and_push(repo_dir: Path, repo_name: str) -> bool:
         ["git", "commit", "-m", COMMIT_MSG]
     )
     if not success:
-        print(f"   ❌ Erro ao fazer commit: {output}")
-        return False
+        return False, f"   ❌ Erro ao fazer commit: {output}"
 
     # Push
     success, output = run_git_command(
@@ -84,42 +89,48 @@ def commit_and_push(repo_dir: Path, repo_name: str) -> bool:
         ["git", "push", "origin", "main"]
     )
     if not success:
-        print(f"   ❌ Erro ao fazer push: {output}")
-        return False
+        return False, f"   ❌ Erro ao fazer push: {output}"
+
+    return True, ""
+
+
+def process_repo(repo: str) -> tuple[str, str]:
+    """Processa um repositório. Retorna (mensagem, resultado: updated/skipped/error)."""
+    repo_dir = BASE_DIR / repo
 
-    return True
+    # Verificar se o repositório existe
+    if not repo_dir.exists():
+        return f"⚠️  {repo} - não encontrado, pulando", "skipped"
+
+    # Verificar se há mudanças
+    changed, error = has_changes(repo_dir)
+    if error:
+        return f"{error}\n❌ {repo} - erro ao verificar mudanças", "error"
+    if not changed:
+        return f"ℹ️  {repo} - sem mudanças no workflow", "skipped"
+
+    # Fazer commit e push
+    success, error = commit_and_push(repo_dir, repo)
+    if success:
+        return f"✅ {repo} - committed and pushed", "updated"
+    return f"{error}\n❌ {repo} - erro ao fazer commit/push", "error"
 
 
 def main():
     print("🚀 Iniciando commit e push das mudanças...")
     print()
 
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
-
-    for repo in REPOS:
-        repo_dir = BASE_DIR / repo
-
-        # Verificar se o repositório existe
-        if not repo_dir.exists():
-            print(f"⚠️  {repo} - não encontrado, pulando")
-            skipped_count += 1
-            continue
-
-        # Verificar se há mudanças
-        if not has_changes(repo_dir):
-            print(f"ℹ️  {repo} - sem mudanças no workflow")
-            skipped_count += 1
-            continue
-
-        # Fazer commit e push
-        if commit_and_push(repo_dir, repo):
-            print(f"✅ {repo} - committed and pushed")
-            updated_count += 1
-        else:
-            print(f"❌ {repo} - erro ao fazer commit/push")
-            error_count += 1
+    # executor.map devolve os resultados na ordem de REPOS
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(process_repo, REPOS))
+
+    for message, _ in results:
+        print(message)
+
+    outcomes = [outcome for _, outcome in results]
+    updated_count = outcomes.count("updated")
+    skipped_count = outcomes.count("skipped")
+    error_count = outcomes.count("error")
 
     print()
     print("🎉 Processo concluído!")
@@ -18,9 +18,29 @@ Example usage:
 __version__ = "0.1.0"
 __author__ = "Equidade Team"
 
-# Import main classes for convenience
-from equidade_data_package.aws import parquet_loader
-from equidade_data_package.gcp import storage, bigquery
+import importlib
+
+# Convenience submodules, imported on first attribute access so that light
+# entry points (e.g. equidade_data_package.config in a Cloud Function) don't
+# pay for pandas, boto3 and google-cloud imports at cold start
+_LAZY_SUBMODULES = {
+    "parquet_loader": "equidade_data_package.aws.parquet_loader",
+    "storage": "equidade_data_package.gcp.storage",
+    "bigquery": "equidade_data_package.gcp.bigquery",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(_LAZY_SUBMODULES[name])
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_SUBMODULES])
+
 
 __all__ = [
     "parquet_loader",
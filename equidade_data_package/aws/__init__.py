@@ -2,6 +2,7 @@
 
 from equidade_data_package.aws.parquet_loader import (
     load_treated_data,
+    load_treated_data_streaming,
     filter_recent_files,
     discover_parquet_files,
     read_parquet_robust,
@@ -9,6 +10,7 @@ from equidade_data_package.aws.parquet_loader import (
 
 __all__ = [
     "load_treated_data",
+    "load_treated_data_streaming",
     "filter_recent_files",
     "discover_parquet_files",
     "read_parquet_robust",
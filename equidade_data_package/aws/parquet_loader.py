@@ -2,12 +2,53 @@
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 import logging
 import re
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, List, Tuple, Union
 from datetime import datetime
 
+# 16 parallel reads saturate S3 bandwidth for a single process
+_MAX_PARALLEL_READS = 16
+pa.set_io_thread_count(_MAX_PARALLEL_READS)
+
+# Coalesce (row_group, column) byte ranges into few, batched S3 requests
+_PARQUET_SCAN_OPTIONS = ds.ParquetFragmentScanOptions(
+    pre_buffer=True,
+    cache_options=pa.CacheOptions(hole_size_limit=1 << 20, range_size_limit=32 << 20),
+)
+
+# Open several files and prefetch batches ahead of decoding, so downloads of
+# the next fragments overlap with work on the current one
+_SCAN_READAHEAD = {"fragment_readahead": 4, "batch_readahead": 16}
+
+# Hour-precision patterns embedded in file paths
+_ISO_HOUR_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})[T_-]?(\d{2})")  # YYYY-MM-DD[T_-]HH
+_TIMESTAMP_DIR_PATTERN = re.compile(r"/(\d{10})/")  # Unix timestamp directory
+
+# Date patterns: ISO date, or a digit run read as YYYYMMDD / Unix timestamp
+_DATE_PATTERN = re.compile(r"(?P<iso>\d{4}-\d{2}-\d{2})|(?P<digits>\d{8,})")
+
+# Strings accepted as numbers when re-inferring types in the string fallback
+_NUMERIC_STRING_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+# Minimum share of filenames with an hour to skip the S3 metadata fetch
+_FILENAME_HOUR_MIN_RATIO = 0.9
+
+# Type replacements for create_safe_schema: null columns become string,
+# int64 columns keep their type but are made nullable
+_SAFE_TYPES = {pa.null(): pa.string(), pa.int64(): pa.int64()}
+
+# Filters in PyArrow's DNF list-of-tuples format, or a compute expression
+Filters = Union[List[Tuple], List[List[Tuple]], pc.Expression]
+
+# Successful discovery path per (base_path, agente), reused across calls
+_DISCOVERED_PATHS: Dict[Tuple[str, str], str] = {}
+
 
 def load_treated_data(
     agente: str,
@@ -15,6 +56,7 @@ def load_treated_data(
     aws_secret_key: str,
     only_recent: bool = True,
     max_files: int = None,
+    filters: Optional[Filters] = None,
 ) -> Optional[pd.DataFrame]:
     """
     Carrega arquivo de dados tratados do S3 com detecção automática de arquivos
@@ -26,42 +68,33 @@ def load_treated_data(
         aws_secret_key: Chave secreta AWS
         only_recent: Se True, carrega apenas os arquivos mais recentes
         max_files: Número máximo de arquivos para carregar (None = todos)
+        filters: Filtros de linha no formato do PyArrow, ex. [("ANO", ">=", 2024)].
+            As estatísticas min/max de cada row group são usadas para pular row
+            groups inteiros sem baixá-los. Linhas com KEY nula são sempre excluídas.
     """
-    agente_formatted = agente.lower()
-
-    # Construct S3 path pattern
-    s3_base_path = "landing-zone-iu-prod/saida/equidade.info/saida/transform/equidade.info/tratados"
-    s3_agent_path = f"{s3_base_path}/{agente_formatted}/"
-
     # Create S3 filesystem
     fs = pa.fs.S3FileSystem(access_key=aws_access_key, secret_key=aws_secret_key)
 
     try:
-        # Try to find files for this agent
-        parquet_files = discover_parquet_files(fs, s3_agent_path, agente_formatted)
-
+        s3_agent_path, parquet_files = _find_treated_files(
+            fs, agente, only_recent, max_files
+        )
         if not parquet_files:
-            logging.warning(
-                f"No parquet files found for agent '{agente}' in path: {s3_agent_path}"
-            )
             return None
 
-        # Filter to recent files if requested
-        if only_recent or max_files:
-            parquet_files = filter_recent_files(fs, parquet_files, max_files)
-
-        logging.info(
-            f"Found {len(parquet_files)} files for agent '{agente}' (filtered: {only_recent or max_files is not None})"
+        # Read the data with robust error handling, deduplicated on KEY
+        df = read_parquet_robust(
+            fs,
+            s3_agent_path,
+            parquet_files,
+            dedup_key="KEY",
+            filters=_treated_data_filter(filters),
         )
 
-        # Read the data with robust error handling
-        df = read_parquet_robust(fs, s3_agent_path, parquet_files)
-
         if df is not None:
             logging.info(
                 f"Successfully loaded {df.shape[0]} rows, {df.shape[1]} columns for agent '{agente}'"
             )
-            df = df.drop_duplicates(subset="KEY")
 
         return df
 
@@ -70,6 +103,109 @@ def load_treated_data(
         return None
 
 
+def load_treated_data_streaming(
+    agente: str,
+    aws_access_key: str,
+    aws_secret_key: str,
+    only_recent: bool = True,
+    max_files: int = None,
+    filters: Optional[Filters] = None,
+    batch_size: int = 60000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Versão em streaming de load_treated_data: gera DataFrames por lote em vez
+    de materializar todos os dados, mantendo a memória proporcional a um lote
+
+    Os lotes já vêm sem KEY repetida (considerando todos os lotes anteriores).
+    Usa apenas a estratégia de schema unificado; para os fallbacks de schema
+    problemático, use load_treated_data.
+
+    Args:
+        agente: Nome do agente (alunos, professores, etc.)
+        aws_access_key: Chave de acesso AWS
+        aws_secret_key: Chave secreta AWS
+        only_recent: Se True, carrega apenas os arquivos mais recentes
+        max_files: Número máximo de arquivos para carregar (None = todos)
+        filters: Filtros de linha no formato do PyArrow (ver load_treated_data)
+        batch_size: Número máximo de linhas por lote
+    """
+    # Create S3 filesystem
+    fs = pa.fs.S3FileSystem(access_key=aws_access_key, secret_key=aws_secret_key)
+
+    try:
+        _, parquet_files = _find_treated_files(fs, agente, only_recent, max_files)
+        if not parquet_files:
+            return
+
+        original_schema = pq.ParquetFile(parquet_files[0], filesystem=fs).schema_arrow
+        dataset = ds.dataset(
+            parquet_files,
+            filesystem=fs,
+            format="parquet",
+            schema=create_safe_schema(original_schema),
+        )
+        scanner = dataset.scanner(
+            filter=_treated_data_filter(filters),
+            batch_size=batch_size,
+            use_threads=True,
+            fragment_scan_options=_PARQUET_SCAN_OPTIONS,
+            **_SCAN_READAHEAD,
+        )
+
+        seen_keys = set()
+        for batch in scanner.to_batches():
+            table = _drop_seen_keys(pa.Table.from_batches([batch]), "KEY", seen_keys)
+            if table.num_rows:
+                yield table.to_pandas(safe=False)
+
+    except Exception as e:
+        logging.error(f"Error streaming treated data for agent '{agente}': {str(e)}")
+
+
+def _find_treated_files(
+    fs: pa.fs.S3FileSystem, agente: str, only_recent: bool, max_files: Optional[int]
+) -> Tuple[str, List[str]]:
+    """
+    Localiza (e opcionalmente filtra) os arquivos tratados de um agente
+    """
+    agente_formatted = agente.lower()
+
+    # Construct S3 path pattern
+    s3_base_path = "landing-zone-iu-prod/saida/equidade.info/saida/transform/equidade.info/tratados"
+    s3_agent_path = f"{s3_base_path}/{agente_formatted}/"
+
+    # Try to find files for this agent
+    parquet_files = discover_parquet_files(fs, s3_agent_path, agente_formatted)
+
+    if not parquet_files:
+        logging.warning(
+            f"No parquet files found for agent '{agente}' in path: {s3_agent_path}"
+        )
+        return s3_agent_path, []
+
+    # Filter to recent files if requested
+    if only_recent or max_files:
+        parquet_files = filter_recent_files(fs, parquet_files, max_files)
+
+    logging.info(
+        f"Found {len(parquet_files)} files for agent '{agente}' (filtered: {only_recent or max_files is not None})"
+    )
+
+    return s3_agent_path, parquet_files
+
+
+def _treated_data_filter(filters: Optional[Filters]) -> pc.Expression:
+    """
+    Combina os filtros do usuário com a exclusão de linhas sem KEY
+    """
+    # Rows without KEY are useless after dedup; null counts let Arrow skip
+    # row groups where KEY is entirely null
+    key_filter = pc.field("KEY").is_valid()
+    if filters is not None:
+        key_filter = key_filter & _to_filter_expression(filters)
+    return key_filter
+
+
 def filter_recent_files(
     fs: pa.fs.S3FileSystem, parquet_files: List[str], max_files: int = None
 ) -> List[str]:
@@ -80,28 +216,20 @@ def filter_recent_files(
         return []
 
     try:
-        # Get file info with modification times
-        files_with_info = []
-        for file_path in parquet_files:
-            try:
-                file_info = fs.get_file_info(file_path)
-                # Get modification time, fallback to filename if not available
-                mod_time = getattr(file_info, "mtime", None)
-
-                # Convert mod_time to timestamp if it's a datetime
-                if isinstance(mod_time, datetime):
-                    mod_time = mod_time.timestamp()
+        # Prefer the hour embedded in filenames; it needs no S3 requests
+        hours_from_names = [extract_hour_from_filename(f) for f in parquet_files]
+        matched = sum(1 for hour in hours_from_names if hour is not None)
 
-                # If no modification time, try to extract date from filename
-                if mod_time is None:
-                    mod_time = extract_date_from_filename(file_path)
-
-                files_with_info.append((file_path, mod_time))
-
-            except Exception as e:
-                logging.warning(f"Could not get info for file {file_path}: {e}")
-                # Include file with timestamp 0 as fallback
-                files_with_info.append((file_path, 0))
+        if matched >= _FILENAME_HOUR_MIN_RATIO * len(parquet_files):
+            logging.debug(
+                f"Using filename timestamps for {matched}/{len(parquet_files)} files"
+            )
+            files_with_info = [
+                (file_path, hour or 0)
+                for file_path, hour in zip(parquet_files, hours_from_names)
+            ]
+        else:
+            files_with_info = _timestamps_from_metadata(fs, parquet_files)
 
         # Group files by hour (truncate to hour precision)
         hour_groups = {}
@@ -163,37 +291,90 @@ def filter_recent_files(
         return parquet_files
 
 
+def _timestamps_from_metadata(
+    fs: pa.fs.S3FileSystem, parquet_files: List[str]
+) -> List[Tuple[str, float]]:
+    """
+    Obtém o horário de modificação dos arquivos no S3 (uma única chamada em lote)
+    """
+    file_infos = fs.get_file_info(parquet_files)
+
+    files_with_info = []
+    for file_path, file_info in zip(parquet_files, file_infos):
+        # Get modification time, fallback to filename if not available
+        mod_time = file_info.mtime
+
+        # Convert mod_time to timestamp if it's a datetime
+        if isinstance(mod_time, datetime):
+            mod_time = mod_time.timestamp()
+
+        # If no modification time, try to extract date from filename
+        if mod_time is None:
+            mod_time = extract_date_from_filename(file_path)
+
+        files_with_info.append((file_path, mod_time))
+
+    return files_with_info
+
+
+def extract_hour_from_filename(filename: str) -> Optional[int]:
+    """
+    Tenta extrair um timestamp com precisão de hora do nome do arquivo
+    """
+    match = _ISO_HOUR_PATTERN.search(filename)
+    if match:
+        try:
+            dt = datetime.strptime(f"{match.group(1)} {match.group(2)}", "%Y-%m-%d %H")
+            return int(dt.timestamp())
+        except ValueError:
+            pass
+
+    match = _TIMESTAMP_DIR_PATTERN.search(filename)
+    if match:
+        return int(match.group(1))
+
+    return None
+
+
 def extract_date_from_filename(filename: str) -> int:
     """
     Tenta extrair uma data/timestamp do nome do arquivo para ordenação
     """
-    # Common patterns in parquet filenames
-    patterns = [
-        r"(\d{4}-\d{2}-\d{2})",  # YYYY-MM-DD
-        r"(\d{8})",  # YYYYMMDD
-        r"(\d{4}\d{2}\d{2})",  # YYYYMMDD
-        r"(\d{13})",  # Unix timestamp with milliseconds
-        r"(\d{10})",  # Unix timestamp
-    ]
+    hour_timestamp = extract_hour_from_filename(filename)
+    if hour_timestamp is not None:
+        return hour_timestamp
 
-    for pattern in patterns:
-        match = re.search(pattern, filename)
-        if match:
-            date_str = match.group(1)
-            try:
-                if len(date_str) == 10 and date_str.count("-") == 2:  # YYYY-MM-DD
-                    dt = datetime.strptime(date_str, "%Y-%m-%d")
-                    return int(dt.timestamp())
-                elif len(date_str) == 8:  # YYYYMMDD
-                    dt = datetime.strptime(date_str, "%Y%m%d")
-                    return int(dt.timestamp())
-                elif len(date_str) in [10, 13]:  # Unix timestamp
-                    return int(date_str[:10])  # Convert to seconds if needed
+    for match in _DATE_PATTERN.finditer(filename):
+        try:
+            if match.lastgroup == "iso":  # YYYY-MM-DD
+                dt = datetime.strptime(match.group("iso"), "%Y-%m-%d")
+                return int(dt.timestamp())
+
+            digits = match.group("digits")
+            try:  # YYYYMMDD
+                dt = datetime.strptime(digits[:8], "%Y%m%d")
+                return int(dt.timestamp())
             except ValueError:
-                continue
+                if len(digits) >= 10:  # Unix timestamp (seconds or milliseconds)
+                    return int(digits[:10])  # Convert to seconds if needed
+        except ValueError:
+            continue
 
-    # Fallback: use hash of filename for consistent ordering
-    return hash(filename) % (10**10)
+    # Fallback: stable hash of filename for consistent ordering across runs
+    # (built-in hash() is randomized per process); kept below 10**10 so the
+    # value stays a valid datetime.fromtimestamp() input
+    return _fnv1a_64(filename.encode("utf-8")) % 10**10
+
+
+def _fnv1a_64(data: bytes) -> int:
+    """
+    Hash FNV-1a de 64 bits, determinístico entre execuções
+    """
+    h = 0xCBF29CE484222325
+    for byte in data:
+        h ^= byte
+        h = (h * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+    return h
 
 
 def discover_parquet_files(
@@ -201,6 +382,9 @@ def discover_parquet_files(
 ) -> List[str]:
     """
     Descobre arquivos parquet para um agente específico com múltiplas estratégias
+
+    Os caminhos candidatos são listados em paralelo; o primeiro caminho (na ordem
+    de prioridade) que contiver arquivos é usado e memorizado para chamadas futuras.
     """
     possible_paths = [
         base_path,  # Direct path
@@ -210,54 +394,97 @@ def discover_parquet_files(
         f'{base_path.rstrip("/")}_{agente}/',  # Underscore format
     ]
 
+    # Try the path that worked last time before fanning out
+    cached_path = _DISCOVERED_PATHS.get((base_path, agente))
+    if cached_path is not None:
+        found_files = _list_parquet_files(fs, cached_path)
+        if found_files:
+            logging.info(
+                f"Found {len(found_files)} parquet files in cached path: {cached_path}"
+            )
+            return sorted(dict.fromkeys(found_files))  # Remove duplicates, stable order
+
     parquet_files = []
 
-    for path in possible_paths:
-        try:
-            # List files in the directory
-            file_info = fs.get_file_info(pa.fs.FileSelector(path, recursive=True))
-            found_files = [
-                info.path
-                for info in file_info
-                if info.path.endswith(".parquet") and info.type == pa.fs.FileType.File
-            ]
+    with ThreadPoolExecutor(max_workers=len(possible_paths)) as executor:
+        results = list(
+            executor.map(lambda path: _list_parquet_files(fs, path), possible_paths)
+        )
 
-            if found_files:
-                logging.info(f"Found {len(found_files)} parquet files in path: {path}")
-                parquet_files.extend(found_files)
-                break  # Use first successful path
+    # Pick in priority order to keep "first successful path" semantics
+    for path, found_files in zip(possible_paths, results):
+        if found_files:
+            logging.info(f"Found {len(found_files)} parquet files in path: {path}")
+            parquet_files.extend(found_files)
+            _DISCOVERED_PATHS[(base_path, agente)] = path
+            break  # Use first successful path
 
-        except Exception as e:
-            logging.debug(f"Path {path} not accessible: {str(e)}")
-            continue
+    return sorted(dict.fromkeys(parquet_files))  # Remove duplicates, stable order
+
+
+def _list_parquet_files(fs: pa.fs.S3FileSystem, path: str) -> List[str]:
+    """
+    Lista recursivamente os arquivos parquet de um caminho (vazio se inacessível)
+    """
+    try:
+        file_info = fs.get_file_info(pa.fs.FileSelector(path, recursive=True))
+    except Exception as e:
+        logging.debug(f"Path {path} not accessible: {str(e)}")
+        return []
 
-    return list(set(parquet_files))  # Remove duplicates
+    return [
+        info.path
+        for info in file_info
+        if info.path.endswith(".parquet") and info.type == pa.fs.FileType.File
+    ]
 
 
 def read_parquet_robust(
-    fs: pa.fs.S3FileSystem, base_path: str, parquet_files: List[str]
+    fs: pa.fs.S3FileSystem,
+    base_path: str,
+    parquet_files: List[str],
+    dedup_key: Optional[str] = None,
+    filters: Optional[Filters] = None,
 ) -> Optional[pd.DataFrame]:
     """
     Lê arquivos parquet com tratamento robusto de problemas de schema
+
+    Args:
+        dedup_key: Se informado, remove linhas com chave repetida (mantém a primeira)
+        filters: Filtros de linha no formato do PyArrow; row groups cujas
+            estatísticas min/max não atendem ao filtro não são lidos
     """
     if not parquet_files:
         return None
 
+    # Fetch the first file's schema once; strategies 1 and 3 both reuse it
+    try:
+        original_schema = pq.ParquetFile(parquet_files[0], filesystem=fs).schema_arrow
+    except Exception as e:
+        logging.warning(f"Could not read schema from {parquet_files[0]}: {str(e)}")
+        original_schema = None
+
     # Strategy 1: Try reading all files together with schema handling
     try:
-        return read_with_unified_schema(fs, base_path, parquet_files)
+        return read_with_unified_schema(
+            fs, base_path, parquet_files, original_schema, filters, dedup_key
+        )
     except Exception as e:
         logging.warning(f"Unified schema read failed: {str(e)}")
 
     # Strategy 2: Try reading files individually and concatenating
     try:
-        return read_files_individually(fs, parquet_files)
+        return read_files_individually(
+            fs, parquet_files, dedup_key=dedup_key, filters=filters
+        )
     except Exception as e:
         logging.warning(f"Individual file read failed: {str(e)}")
 
     # Strategy 3: Try reading all as strings
     try:
-        return read_as_strings(fs, base_path, parquet_files)
+        return read_as_strings(
+            fs, base_path, parquet_files, original_schema, filters, dedup_key
+        )
     except Exception as e:
         logging.error(f"String read fallback failed: {str(e)}")
 
@@ -265,108 +492,218 @@ def read_parquet_robust(
 
 
 def read_with_unified_schema(
-    fs: pa.fs.S3FileSystem, base_path: str, parquet_files: List[str]
+    fs: pa.fs.S3FileSystem,
+    base_path: str,
+    parquet_files: List[str],
+    original_schema: Optional[pa.Schema] = None,
+    filters: Optional[Filters] = None,
+    dedup_key: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Tenta ler com schema unificado, convertendo tipos problemáticos
+
+    Args:
+        original_schema: Schema já lido do primeiro arquivo (evita novo acesso ao S3)
+        filters: Filtros de linha no formato do PyArrow
+        dedup_key: Se informado, remove chaves repetidas antes de converter para pandas
     """
     # Get schema from first file
-    first_file = parquet_files[0]
-    parquet_file = pq.ParquetFile(first_file, filesystem=fs)
-    original_schema = parquet_file.schema_arrow
+    if original_schema is None:
+        original_schema = pq.ParquetFile(parquet_files[0], filesystem=fs).schema_arrow
 
     # Create safe schema
     safe_schema = create_safe_schema(original_schema)
 
     # Read only the filtered files with safe schema
-    table = pq.read_table(
-        parquet_files, filesystem=fs, schema=safe_schema, use_pandas_metadata=False
-    )
+    table = _read_dataset(fs, parquet_files, safe_schema, filters)
+
+    if dedup_key:
+        table = _drop_duplicate_keys(table, dedup_key)
 
-    return table.to_pandas(safe=False)
+    return table.to_pandas(safe=False, split_blocks=True, self_destruct=True)
 
 
 def read_files_individually(
-    fs: pa.fs.S3FileSystem, parquet_files: List[str]
+    fs: pa.fs.S3FileSystem,
+    parquet_files: List[str],
+    dedup_key: Optional[str] = None,
+    filters: Optional[Filters] = None,
 ) -> pd.DataFrame:
     """
     Lê arquivos individualmente e concatena
+
+    Args:
+        dedup_key: Se informado, remove chaves repetidas arquivo a arquivo
+        filters: Filtros de linha no formato do PyArrow
     """
-    dfs = []
+    tables = []
     failed_files = []
+    seen_keys = set()
+
+    def _read_one(file_path: str) -> pa.Table:
+        return pq.read_table(
+            f"s3://{file_path}",
+            filesystem=fs,
+            filters=filters,
+            use_pandas_metadata=False,
+        )
 
-    for file_path in parquet_files:
-        try:
-            # Try reading individual file
-            table = pq.read_table(
-                f"s3://{file_path}", filesystem=fs, use_pandas_metadata=False
-            )
-            df = table.to_pandas(safe=False)
-            dfs.append(df)
+    # Reads are I/O-bound and Arrow releases the GIL, so fetch files concurrently
+    with ThreadPoolExecutor(max_workers=_MAX_PARALLEL_READS) as executor:
+        futures = [executor.submit(_read_one, file_path) for file_path in parquet_files]
 
-        except Exception as e:
-            logging.warning(f"Failed to read file {file_path}: {str(e)}")
-            failed_files.append(file_path)
-            continue
+        # Collect in file order so "first occurrence wins" stays deterministic
+        for file_path, future in zip(parquet_files, futures):
+            try:
+                table = future.result()
+
+                if dedup_key:
+                    # Drop keys repeated within this file or seen in earlier files
+                    table = _drop_seen_keys(table, dedup_key, seen_keys)
+
+                tables.append(table)
 
-    if not dfs:
+            except Exception as e:
+                logging.warning(f"Failed to read file {file_path}: {str(e)}")
+                failed_files.append(file_path)
+                continue
+
+    if not tables:
         raise Exception(
             f"No files could be read successfully. Failed files: {failed_files}"
         )
 
     if failed_files:
         logging.warning(
-            f"Successfully read {len(dfs)} files, failed on {len(failed_files)} files"
+            f"Successfully read {len(tables)} files, failed on {len(failed_files)} files"
         )
 
-    # Concatenate all successful reads
-    return pd.concat(dfs, ignore_index=True, sort=False)
+    # Concatenate all successful reads in Arrow (shares buffers, no copy)
+    try:
+        combined = pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        # Schemas too divergent for Arrow promotion; let pandas reconcile them
+        logging.debug(f"Arrow concat failed, falling back to pandas: {str(e)}")
+        dfs = [table.to_pandas(safe=False) for table in tables]
+        return pd.concat(dfs, ignore_index=True, sort=False)
+
+    del tables
+    df = combined.to_pandas(safe=False, split_blocks=True, self_destruct=True)
+    return df.reset_index(drop=True)
+
+
+def _drop_duplicate_keys(table: pa.Table, key: str) -> pa.Table:
+    """
+    Remove linhas com chave repetida na tabela, mantendo a primeira ocorrência
+
+    Só a máscara de duplicados; não guarda as chaves em um set Python.
+    """
+    keys = table[key].to_pandas(types_mapper=pd.ArrowDtype)
+    return table.filter(pa.array(~keys.duplicated(keep="first").to_numpy()))
+
+
+def _drop_seen_keys(table: pa.Table, key: str, seen_keys: set) -> pa.Table:
+    """
+    Remove linhas com chave repetida na tabela ou já vista em tabelas anteriores
+    """
+    # One hash probe per row against the persistent set; isin() would turn
+    # the whole (growing) set into an array on every call
+    keep = []
+    append = keep.append
+    add = seen_keys.add
+    for value in table[key].to_pylist():
+        if value in seen_keys:
+            append(False)
+        else:
+            add(value)
+            append(True)
+    return table.filter(pa.array(keep, pa.bool_()))
 
 
 def read_as_strings(
-    fs: pa.fs.S3FileSystem, base_path: str, parquet_files: List[str]
+    fs: pa.fs.S3FileSystem,
+    base_path: str,
+    parquet_files: List[str],
+    original_schema: Optional[pa.Schema] = None,
+    filters: Optional[Filters] = None,
+    dedup_key: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Fallback: lê todos os campos como strings
+
+    Args:
+        original_schema: Schema já lido do primeiro arquivo (evita novo acesso ao S3)
+        filters: Filtros de linha no formato do PyArrow
+        dedup_key: Se informado, remove chaves repetidas antes de converter para pandas
     """
     # Get schema from first file
-    first_file = parquet_files[0]
-    parquet_file = pq.ParquetFile(first_file, filesystem=fs)
-    original_schema = parquet_file.schema_arrow
+    if original_schema is None:
+        original_schema = pq.ParquetFile(parquet_files[0], filesystem=fs).schema_arrow
 
     # Create string-only schema
     string_fields = [pa.field(field.name, pa.string()) for field in original_schema]
     string_schema = pa.schema(string_fields)
 
-    # Read only the filtered files with string schema
-    table = pq.read_table(
-        parquet_files, filesystem=fs, schema=string_schema, use_pandas_metadata=False
-    )
+    # Filters compare against the original types and would fail on the
+    # all-string schema; only the KEY null check is pushed down to the scan
+    key_filter = pc.field("KEY").is_valid() if "KEY" in string_schema.names else None
+    table = _read_dataset(fs, parquet_files, string_schema, key_filter)
 
-    df = table.to_pandas(safe=False)
+    # Try to convert obvious numeric columns back (in Arrow, before pandas)
+    table = convert_numeric_columns_arrow(table)
 
-    # Try to convert obvious numeric columns back
-    df = convert_numeric_columns(df)
+    # User filters run once numeric types are restored
+    if filters is not None:
+        table = table.filter(_to_filter_expression(filters))
 
-    return df
+    if dedup_key:
+        table = _drop_duplicate_keys(table, dedup_key)
+
+    return table.to_pandas(safe=False, split_blocks=True, self_destruct=True)
+
+
+def _read_dataset(
+    fs: pa.fs.S3FileSystem,
+    parquet_files: List[str],
+    schema: pa.Schema,
+    filters: Optional[Filters] = None,
+) -> pa.Table:
+    """
+    Lê os arquivos como um único dataset, com pre-buffer dos byte ranges
+    """
+    dataset = ds.dataset(parquet_files, filesystem=fs, format="parquet", schema=schema)
+    scanner = dataset.scanner(
+        filter=_to_filter_expression(filters),
+        use_threads=True,
+        fragment_scan_options=_PARQUET_SCAN_OPTIONS,
+        **_SCAN_READAHEAD,
+    )
+    return scanner.to_table()
+
+
+def _to_filter_expression(filters: Optional[Filters]) -> Optional[pc.Expression]:
+    """
+    Converte filtros no formato list-of-tuples para uma expressão do PyArrow
+    """
+    if filters is None or isinstance(filters, pc.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
 
 
+@lru_cache(maxsize=32)
 def create_safe_schema(original_schema: pa.Schema) -> pa.Schema:
     """
     Cria schema seguro convertendo tipos problemáticos
     """
-    new_fields = []
-    for field in original_schema:
-        if field.type == pa.null():
-            # Convert null columns to string
-            new_fields.append(pa.field(field.name, pa.string()))
-        elif field.type == pa.int64():
-            # Keep int64 columns but make them nullable
-            new_fields.append(pa.field(field.name, pa.int64(), nullable=True))
-        else:
-            # Keep other types as they are
-            new_fields.append(field)
-    return pa.schema(new_fields)
+    # Replaced fields are rebuilt with pa.field's default nullable=True
+    return pa.schema(
+        [
+            pa.field(field.name, _SAFE_TYPES[field.type])
+            if field.type in _SAFE_TYPES
+            else field
+            for field in original_schema
+        ]
+    )
 
 
 def convert_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -375,27 +712,46 @@ def convert_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     for col in df.columns:
         if df[col].dtype == "object":
-            # Try to convert to numeric if all non-null values look numeric
-            try:
-                # Check if all non-null values are numeric strings
-                non_null_values = df[col].dropna()
-                if len(non_null_values) > 0:
-                    # Simple check for numeric strings
-                    sample_values = non_null_values.head(100)
-                    numeric_count = 0
-
-                    for val in sample_values:
-                        try:
-                            float(str(val))
-                            numeric_count += 1
-                        except (ValueError, TypeError):
-                            pass
-
-                    # If most values look numeric, try conversion
-                    if numeric_count / len(sample_values) > 0.8:
-                        df[col] = pd.to_numeric(df[col], errors="coerce")
-            except Exception:
-                # If conversion fails, keep as string
-                pass
+            non_null_count = df[col].notna().sum()
+            if non_null_count == 0:
+                continue
+
+            # Vectorized probe: values that fail to parse become NaN
+            converted = pd.to_numeric(df[col], errors="coerce")
+
+            # If most values look numeric, keep the conversion
+            if converted.notna().sum() / non_null_count > 0.8:
+                df[col] = converted
 
     return df
+
+
+def convert_numeric_columns_arrow(table: pa.Table) -> pa.Table:
+    """
+    Tenta converter colunas string obviamente numéricas de volta para números,
+    direto na tabela Arrow (mesmo critério de convert_numeric_columns)
+    """
+    for i, field in enumerate(table.schema):
+        if not pa.types.is_string(field.type):
+            continue
+
+        column = pc.utf8_trim_whitespace(table.column(i))
+        non_null_count = len(column) - column.null_count
+        if non_null_count == 0:
+            continue
+
+        # If most values look numeric, try conversion
+        is_numeric = pc.match_substring_regex(column, _NUMERIC_STRING_PATTERN)
+        if (pc.sum(is_numeric).as_py() or 0) / non_null_count <= 0.8:
+            continue
+
+        # Non-numeric values become null, like pd.to_numeric(errors="coerce")
+        column = pc.if_else(is_numeric, column, pa.scalar(None, pa.string()))
+        for target_type in (pa.int64(), pa.float64()):
+            try:
+                table = table.set_column(i, field.name, pc.cast(column, target_type))
+                break
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+
+    return table
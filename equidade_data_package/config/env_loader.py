@@ -23,13 +23,304 @@ Usage:
     env.set_environment()
 """
 
+import hashlib
 import json
+import logging
 import os
+import re
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+# orjson (optional) parses large JSON secrets several times faster; its
+# JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+logger = logging.getLogger(__name__)
+
+# Lista de palavras-chave de variáveis sensíveis
+_SECRET_KEYWORDS = (
+    "CREDENTIALS",
+    "TOKEN",
+    "KEY",
+    "SECRET",
+    "PASSWORD",
+    "AUTHORIZATION",
+    "AUTORIZATION",  # Typo no nome original
+)
+_SECRET_PATTERN = re.compile("|".join(map(re.escape, _SECRET_KEYWORDS)))
+
+# YAML do pacote, resolvido uma vez no import
+# __file__ = .../equidade_data_package/config/env_loader.py
+# parent = .../equidade_data_package/config/
+# parent.parent = .../equidade_data_package/
+_DEFAULT_YAML_PATH = Path(__file__).resolve().parent.parent / "env-files" / "env-shared.yaml"
+
+# Upper bound on concurrent Secret Manager RPCs per loader
+_MAX_SECRET_FETCH_WORKERS = 16
+
+# Secret Manager client shared by all EnvLoader instances (see _get_secret_client)
+_SECRET_CLIENT = None
+_SECRET_CLIENT_UNAVAILABLE = False
+_SECRET_CLIENT_LOCK = threading.Lock()
+
+# Secret values shared by all EnvLoader instances, keyed by (project_id, secret_name)
+_SECRETS_CACHE: Dict[Tuple[str, str], str] = {}
+_SECRETS_CACHE_LOCK = threading.Lock()
+
+# On-disk secret cache (opt-in via EnvConfig.disk_cache_secrets)
+_SECRET_DISK_CACHE_PATH = Path(tempfile.gettempdir()) / ".equidade_secret_cache.json"
+_SECRET_DISK_CACHE_LOCK = threading.Lock()
+
+# Parsed YAML values shared by all EnvLoader instances,
+# keyed by (path, mtime_ns, requested keys)
+_YAML_CACHE: Dict[Tuple[str, int, Tuple[str, ...]], Dict[str, Any]] = {}
+_YAML_CACHE_LOCK = threading.Lock()
+
+# Wheels ship a JSON copy of the YAML next to it (built by hatch_build.py),
+# tagged with the SHA-256 of the YAML it came from; reading it skips PyYAML
+_YAML_JSON_SUFFIX = ".json"
+
+# Fastest safe PyYAML loader class; PyYAML is imported on first use
+_YAML_LOADER = None
+
+
+def _yaml_load_keys(stream, keys: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Parse a top-level YAML mapping, constructing only the values of ``keys``.
+
+    The whole document is still parsed, but values of other keys are never
+    turned into Python objects. PyYAML is imported on the first call.
+    """
+    global _YAML_LOADER
+
+    if _YAML_LOADER is None:
+        import yaml
+
+        # libyaml-backed loader is several times faster; fall back to pure Python
+        _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    loader = _YAML_LOADER(stream)
+    try:
+        root = loader.get_single_node()
+        if root is None or root.tag != "tag:yaml.org,2002:map":
+            return {}
+
+        # Resolve chaves de merge (<<:) como o safe_load; os valores mesclados
+        # vêm antes, então as chaves explícitas continuam prevalecendo
+        loader.flatten_mapping(root)
+
+        # Mapeia para o objeto original do nome, evitando chaves duplicadas em memória
+        wanted = {key: key for key in keys}
+        values = {}
+        for key_node, value_node in root.value:
+            key = wanted.get(loader.construct_object(key_node, deep=True))
+            if key is not None:
+                values[key] = loader.construct_object(value_node, deep=True)
+        return values
+    finally:
+        loader.dispose()
+
+
+def _read_yaml(path: Path, keys: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Read ``keys`` from a YAML file, reusing the result while the file is unchanged.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    resolved = path.resolve()
+    cache_key = (str(resolved), resolved.stat().st_mtime_ns, keys)
+
+    with _YAML_CACHE_LOCK:
+        cached = _YAML_CACHE.get(cache_key)
+        if cached is None:
+            raw = resolved.read_bytes()
+            cached = _read_precompiled_yaml(resolved, raw, keys)
+            if cached is None:
+                # libyaml parses bytes directly (UTF-8 detected from the stream)
+                cached = _yaml_load_keys(raw, keys)
+            _YAML_CACHE[cache_key] = cached
+
+    return cached
+
+
+def _read_precompiled_yaml(
+    path: Path, raw: bytes, keys: Tuple[str, ...]
+) -> Optional[Dict[str, Any]]:
+    """
+    Read ``keys`` from the JSON copy of a YAML file, if one matches its content.
+
+    Returns None when there is no JSON copy or it was built from another
+    version of the YAML (the hash is compared, not mtimes, since wheels
+    normalize file timestamps).
+    """
+    try:
+        with open(path.with_suffix(_YAML_JSON_SUFFIX), "rb") as f:
+            compiled = _json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+    if compiled.get("source_sha256") != hashlib.sha256(raw).hexdigest():
+        return None
+
+    values = compiled.get("values", {})
+    return {key: values[key] for key in keys if key in values}
+
+
+def _is_secret_name(var_name: str) -> bool:
+    """Check if a variable name looks sensitive (see EnvLoader._is_secret_var)."""
+    # Verificamos se CONTÉM (não apenas startswith) para pegar casos como:
+    # - DOCUSIGN_INTEGRATION_KEY (contém "KEY")
+    # - DOCUSIGN_CLIENT_SECRET (contém "SECRET")
+    return _SECRET_PATTERN.search(var_name) is not None
+
+
+def _load_secret_disk_cache_entries() -> Dict[str, Any]:
+    """
+    Load the on-disk secret cache, trusting it only if the current user made it.
+
+    The file lives in the shared temp dir, so anything that is a symlink, not
+    a regular file, owned by another user or readable by others is rejected
+    (another local user could have planted it to inject secret values).
+
+    Raises:
+        FileNotFoundError: If there is no cache file
+        ValueError: If the file exists but is not trusted
+    """
+    flags = os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(_SECRET_DISK_CACHE_PATH, flags)
+    with os.fdopen(fd, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            raise ValueError("not a regular file")
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            raise ValueError("owned by another user")
+        if stat.S_IMODE(st.st_mode) != 0o600:
+            raise ValueError(f"unexpected mode {oct(stat.S_IMODE(st.st_mode))}")
+        return json.load(f)
+
+
+def _read_secret_disk_cache(project_id: str, secret_names: list, ttl: int) -> Dict[str, str]:
+    """
+    Read fresh secrets from the on-disk cache.
+
+    Args:
+        project_id: GCP project ID
+        secret_names: Secret names to look up
+        ttl: Maximum entry age in seconds
+
+    Returns:
+        Dictionary of secret_name -> value for the entries found and not expired
+    """
+    try:
+        entries = _load_secret_disk_cache_entries()
+
+        now = time.time()
+        values = {}
+        for secret_name in secret_names:
+            entry = entries.get(f"{project_id}/{secret_name}")
+            if entry and now - entry["fetched_at"] < ttl:
+                values[secret_name] = entry["value"]
+        return values
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        # Arquivo corrompido, de outro usuário ou em formato inesperado:
+        # ignora e busca do Secret Manager
+        logger.warning("Ignoring secret disk cache: %s", e)
+        return {}
+
+
+def _write_secret_disk_cache(project_id: str, values: Dict[str, str]):
+    """
+    Merge freshly fetched secrets into the on-disk cache (file mode 0600).
+
+    Args:
+        project_id: GCP project ID
+        values: Dictionary of secret_name -> value
+    """
+    with _SECRET_DISK_CACHE_LOCK:
+        try:
+            try:
+                entries = _load_secret_disk_cache_entries()
+            except (OSError, ValueError):
+                entries = {}
+
+            now = time.time()
+            for secret_name, value in values.items():
+                entries[f"{project_id}/{secret_name}"] = {"value": value, "fetched_at": now}
+
+            # Escrita atômica; mkstemp cria um nome imprevisível com O_EXCL
+            # e permissão 0600 (legível apenas pelo usuário atual)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=_SECRET_DISK_CACHE_PATH.parent,
+                prefix=f"{_SECRET_DISK_CACHE_PATH.name}.",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, _SECRET_DISK_CACHE_PATH)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning("Could not write secret disk cache: %s", e)
+
+
+def _split_by_secrecy(
+    env_map: Dict[str, Tuple[str, ...]]
+) -> Tuple[Dict[str, Tuple[str, ...]], Dict[str, Tuple[str, ...]]]:
+    """
+    Split each function's variables into (secrets, non-secrets).
+
+    Functions sharing a profile tuple also share the derived tuples.
+    """
+    splits: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+    secrets: Dict[str, Tuple[str, ...]] = {}
+    non_secrets: Dict[str, Tuple[str, ...]] = {}
+    for function_name, names in env_map.items():
+        if names not in splits:
+            splits[names] = (
+                tuple(name for name in names if _is_secret_name(name)),
+                tuple(name for name in names if not _is_secret_name(name)),
+            )
+        secrets[function_name], non_secrets[function_name] = splits[names]
+    return secrets, non_secrets
+
+
+def _get_secret_client():
+    """
+    Return the process-wide SecretManagerServiceClient, creating it on first use.
 
-import yaml
+    All loaders share one client (and its gRPC channel). Returns None when
+    google-cloud-secret-manager is not installed; the import is attempted once.
+    """
+    global _SECRET_CLIENT, _SECRET_CLIENT_UNAVAILABLE
+
+    if _SECRET_CLIENT is not None or _SECRET_CLIENT_UNAVAILABLE:
+        return _SECRET_CLIENT
+
+    with _SECRET_CLIENT_LOCK:
+        if _SECRET_CLIENT is None and not _SECRET_CLIENT_UNAVAILABLE:
+            try:
+                from google.cloud import secretmanager
+            except ImportError:
+                _SECRET_CLIENT_UNAVAILABLE = True
+                return None
+            _SECRET_CLIENT = secretmanager.SecretManagerServiceClient()
+
+    return _SECRET_CLIENT
 
 
 @dataclass
@@ -42,6 +333,80 @@ class EnvConfig:
     yaml_path: Optional[str] = None
     use_secret_manager: bool = True
     cache_secrets: bool = True
+    # Opt-in: persist fetched secrets to a 0600 file in the temp dir so new
+    # instances on the same host skip the RPCs while the entries are fresh
+    disk_cache_secrets: bool = False
+    disk_cache_ttl: int = 3600
+    # Opt-in stale-while-revalidate: once loaded secrets are older than this
+    # many seconds, refresh_stale_secrets() (called by load_env) refetches them
+    # in a background thread while callers keep getting the current values
+    secret_ttl: Optional[int] = None
+
+
+# Perfis de variáveis compartilhados por mais de uma Cloud Function.
+# Funções com o mesmo perfil referenciam a mesma tupla em FUNCTION_ENV_MAP.
+_ACCESS_PROFILE = (
+    "BIGQUERY_DATASET_ACCESS",
+    "BIGQUERY_TABLE_LOGS",
+    "BIGQUERY_TABLE_REQUESTS",
+    "DOCUSIGN_ACCOUNT_ID",
+    "DOCUSIGN_API_BASE_URL",
+    "DOCUSIGN_BASE_URL",
+    "DOCUSIGN_CLIENT_SECRET",
+    "DOCUSIGN_ENVIRONMENT",
+    "DOCUSIGN_INTEGRATION_KEY",
+    "DOCUSIGN_TEMPLATE_DASH",
+    "DOCUSIGN_TEMPLATE_DATA",
+    "DOCUSIGN_TEMPLATE_TEMP",
+    "ENVIRONMENT",
+    "GCP_PROJECT_ID",
+    "GCP_REGION",
+    "GCP_WEBHOOK_URL",
+    "GMAIL_IMPERSONATE_USER",
+    "GMAIL_TOKEN_DATA",
+    "GOOGLE_DRIVE_FOLDER_EDITAIS",
+    "GOOGLE_SERVICE_ACCOUNT_KEY",
+    "SLACK_BOT_TOKEN_ACCESS",
+    "SLACK_CHANNEL_ACCESS_LOGS",
+    "STRAPI_BASE_URL",
+    "STRAPI_TOKEN",
+)
+_DEPLOY_TRIGGER_PROFILE = (
+    "MAX_WAITING_TIME",
+    "MIN_UPDATES_TO_TRIGGER",
+    "PROJECT_ID",
+    "SLACK_BOT_TOKEN",
+    "TOKEN_GITHUB",
+)
+_RAW_DATA_PROFILE = (
+    "AUTHORIZATION_KEY_BLIP",
+    "CREDENTIALS",
+    "SLACK_BOT_TOKEN",
+    "SURVEYCTO_PASSWORD",
+    "SURVEYCTO_SERVER",
+    "SURVEYCTO_USERNAME",
+)
+_TREATMENT_DATA_PROFILE = (
+    "CREDENTIALS",
+    "SLACK_BOT_TOKEN",
+)
+_SCHOOL_REGISTER_PROFILE = (
+    "GCP_PROJECT_ID",
+    "GCP_REGION",
+    "DOCUSIGN_TEMPLATE_SCHOOL_REGISTER",
+    "DOCUSIGN_ACCOUNT_ID",
+    "DOCUSIGN_API_BASE_URL",
+    "DOCUSIGN_BASE_URL",
+    "BIGQUERY_DATASET_SCHOOL_REGISTER",
+    "SLACK_CHANNEL_SCHOOL_REGISTER_LOGS",
+    "CREDENTIALS",
+    "DOCUSIGN_ACCESS_TOKEN",
+    "DOCUSIGN_INTEGRATION_KEY",
+    "DOCUSIGN_USER_ID",
+    "DOCUSIGN_CLIENT_SECRET",
+    "DOCUSIGN_SIGNING_RETURN_URL",
+    "SIGNING_PROXY_URL",
+)
 
 
 class EnvLoader:
@@ -55,44 +420,19 @@ class EnvLoader:
     Attributes:
         config: EnvConfig with loader configuration
         _env_vars: Cached environment variables
-        _secrets_cache: Cached secrets from Secret Manager
+        _secrets_cache: Secrets resolved by this loader (the cache itself is process-wide)
     """
 
     # Mapeamento de variáveis de ambiente por Cloud Function
     # Baseado na análise das variáveis usadas em cada função
     FUNCTION_ENV_MAP = {
-        "equidade-download-data": [
+        "equidade-download-data": (
             "CREDENTIALS",
             "LOG_EXECUTION_ID",
             "SLACK_BOT_TOKEN",
-        ],
-        "access-processor": [
-            "BIGQUERY_DATASET_ACCESS",
-            "BIGQUERY_TABLE_LOGS",
-            "BIGQUERY_TABLE_REQUESTS",
-            "DOCUSIGN_ACCOUNT_ID",
-            "DOCUSIGN_API_BASE_URL",
-            "DOCUSIGN_BASE_URL",
-            "DOCUSIGN_CLIENT_SECRET",
-            "DOCUSIGN_ENVIRONMENT",
-            "DOCUSIGN_INTEGRATION_KEY",
-            "DOCUSIGN_TEMPLATE_DASH",
-            "DOCUSIGN_TEMPLATE_DATA",
-            "DOCUSIGN_TEMPLATE_TEMP",
-            "ENVIRONMENT",
-            "GCP_PROJECT_ID",
-            "GCP_REGION",
-            "GCP_WEBHOOK_URL",
-            "GMAIL_IMPERSONATE_USER",
-            "GMAIL_TOKEN_DATA",
-            "GOOGLE_DRIVE_FOLDER_EDITAIS",
-            "GOOGLE_SERVICE_ACCOUNT_KEY",
-            "SLACK_BOT_TOKEN_ACCESS",
-            "SLACK_CHANNEL_ACCESS_LOGS",
-            "STRAPI_BASE_URL",
-            "STRAPI_TOKEN",
-        ],
-        "etl-surveycto-function": [
+        ),
+        "access-processor": _ACCESS_PROFILE,
+        "etl-surveycto-function": (
             "AWS_ACCESS_KEY_ID",
             "AWS_REGION",
             "AWS_SECRET_ACCESS_KEY",
@@ -100,8 +440,8 @@ class EnvLoader:
             "SURVEYCTO_PASSWORD",
             "SURVEYCTO_SERVER",
             "SURVEYCTO_USERNAME",
-        ],
-        "check-s3-files": [
+        ),
+        "check-s3-files": (
             "AWS_ACCESS_KEY_ID",
             "AWS_REGION",
             "AWS_SECRET_ACCESS_KEY",
@@ -110,219 +450,68 @@ class EnvLoader:
             "GCP_PROJECT",
             "SLACK_BOT_TOKEN",
             "SLACK_CHANNEL",
-        ],
-        "iu-process-dataset-updates": [
+        ),
+        "iu-process-dataset-updates": (
             "AWS_ACCESS_KEY_ID",
             "AWS_SECRET_ACCESS_KEY",
             "CREDENTIALS",
             "SLACK_BOT_TOKEN",
-        ],
-        "consistency_checker_function": [
+        ),
+        "consistency_checker_function": (
             "AUTORIZATION_BLIP",
             "AWS_ACCESS_KEY_ID",
             "AWS_SECRET_ACCESS_KEY",
             "CREDENTIALS",
             "SLACK_BOT_TOKEN",
-        ],
-        "access-manager": [
-            "BIGQUERY_DATASET_ACCESS",
-            "BIGQUERY_TABLE_LOGS",
-            "BIGQUERY_TABLE_REQUESTS",
-            "DOCUSIGN_ACCOUNT_ID",
-            "DOCUSIGN_API_BASE_URL",
-            "DOCUSIGN_BASE_URL",
-            "DOCUSIGN_CLIENT_SECRET",
-            "DOCUSIGN_ENVIRONMENT",
-            "DOCUSIGN_INTEGRATION_KEY",
-            "DOCUSIGN_TEMPLATE_DASH",
-            "DOCUSIGN_TEMPLATE_DATA",
-            "DOCUSIGN_TEMPLATE_TEMP",
-            "ENVIRONMENT",
-            "GCP_PROJECT_ID",
-            "GCP_REGION",
-            "GCP_WEBHOOK_URL",
-            "GMAIL_IMPERSONATE_USER",
-            "GMAIL_TOKEN_DATA",
-            "GOOGLE_DRIVE_FOLDER_EDITAIS",
-            "GOOGLE_SERVICE_ACCOUNT_KEY",
-            "SLACK_BOT_TOKEN_ACCESS",
-            "SLACK_CHANNEL_ACCESS_LOGS",
-            "STRAPI_BASE_URL",
-            "STRAPI_TOKEN",'DOCUSIGN_SIGNING_RETURN_URL','SIGNING_PROXY_URL'
-        ],
-        "access-revocation": [
-            "BIGQUERY_DATASET_ACCESS",
-            "BIGQUERY_TABLE_LOGS",
-            "BIGQUERY_TABLE_REQUESTS",
-            "DOCUSIGN_ACCOUNT_ID",
-            "DOCUSIGN_API_BASE_URL",
-            "DOCUSIGN_BASE_URL",
-            "DOCUSIGN_CLIENT_SECRET",
-            "DOCUSIGN_ENVIRONMENT",
-            "DOCUSIGN_INTEGRATION_KEY",
-            "DOCUSIGN_TEMPLATE_DASH",
-            "DOCUSIGN_TEMPLATE_DATA",
-            "DOCUSIGN_TEMPLATE_TEMP",
-            "ENVIRONMENT",
-            "GCP_PROJECT_ID",
-            "GCP_REGION",
-            "GCP_WEBHOOK_URL",
-            "GMAIL_IMPERSONATE_USER",
-            "GMAIL_TOKEN_DATA",
-            "GOOGLE_DRIVE_FOLDER_EDITAIS",
-            "GOOGLE_SERVICE_ACCOUNT_KEY",
-            "SLACK_BOT_TOKEN_ACCESS",
-            "SLACK_CHANNEL_ACCESS_LOGS",
-            "STRAPI_BASE_URL",
-            "STRAPI_TOKEN",
-        ],
-        "check-and-trigger-deploy": [
-            "MAX_WAITING_TIME",
-            "MIN_UPDATES_TO_TRIGGER",
-            "PROJECT_ID",
-            "SLACK_BOT_TOKEN",
-            "TOKEN_GITHUB",
-        ],
-        "process-table-update": [
-            "MAX_WAITING_TIME",
-            "MIN_UPDATES_TO_TRIGGER",
-            "PROJECT_ID",
-            "SLACK_BOT_TOKEN",
-            "TOKEN_GITHUB",
-        ],
-        "gf_raw_data_function": [
-            "AUTHORIZATION_KEY_BLIP",
-            "CREDENTIALS",
-            "SLACK_BOT_TOKEN",
-            "SURVEYCTO_PASSWORD",
-            "SURVEYCTO_SERVER",
-            "SURVEYCTO_USERNAME",
-        ],
-        "gf_treatment_data_function": [
-            "CREDENTIALS",
-            "SLACK_BOT_TOKEN",
-        ],
-        "process-dataset-updates": [
+        ),
+        "access-manager": _ACCESS_PROFILE + ("DOCUSIGN_SIGNING_RETURN_URL", "SIGNING_PROXY_URL"),
+        "access-revocation": _ACCESS_PROFILE,
+        "check-and-trigger-deploy": _DEPLOY_TRIGGER_PROFILE,
+        "process-table-update": _DEPLOY_TRIGGER_PROFILE,
+        "gf_raw_data_function": _RAW_DATA_PROFILE,
+        "gf_treatment_data_function": _TREATMENT_DATA_PROFILE,
+        "process-dataset-updates": (
             "CREDENTIALS",
             "CSV_FILE_ID",
             "DICT_ESCOLA",
             "EXCEL_FILE_ID",
             "SLACK_BOT_TOKEN",
-        ],
-        "slack-notifier": [
-            "BIGQUERY_DATASET_ACCESS",
-            "BIGQUERY_TABLE_LOGS",
-            "BIGQUERY_TABLE_REQUESTS",
-            "DOCUSIGN_ACCOUNT_ID",
-            "DOCUSIGN_API_BASE_URL",
-            "DOCUSIGN_BASE_URL",
-            "DOCUSIGN_CLIENT_SECRET",
-            "DOCUSIGN_ENVIRONMENT",
-            "DOCUSIGN_INTEGRATION_KEY",
-            "DOCUSIGN_TEMPLATE_DASH",
-            "DOCUSIGN_TEMPLATE_DATA",
-            "DOCUSIGN_TEMPLATE_TEMP",
-            "ENVIRONMENT",
-            "GCP_PROJECT_ID",
-            "GCP_REGION",
-            "GCP_WEBHOOK_URL",
-            "GMAIL_IMPERSONATE_USER",
-            "GMAIL_TOKEN_DATA",
-            "GOOGLE_DRIVE_FOLDER_EDITAIS",
-            "GOOGLE_SERVICE_ACCOUNT_KEY",
-            "SLACK_BOT_TOKEN_ACCESS",
-            "SLACK_CHANNEL_ACCESS_LOGS",
-            "STRAPI_BASE_URL",
-            "STRAPI_TOKEN",
-        ],
-        "docusign-webhook": [
-            "BIGQUERY_DATASET_ACCESS",
-            "BIGQUERY_TABLE_LOGS",
-            "BIGQUERY_TABLE_REQUESTS",
-            "DOCUSIGN_ACCOUNT_ID",
-            "DOCUSIGN_API_BASE_URL",
-            "DOCUSIGN_BASE_URL",
-            "DOCUSIGN_CLIENT_SECRET",
-            "DOCUSIGN_ENVIRONMENT",
-            "DOCUSIGN_INTEGRATION_KEY",
-            "DOCUSIGN_TEMPLATE_DASH",
-            "DOCUSIGN_TEMPLATE_DATA",
-            "DOCUSIGN_TEMPLATE_TEMP",
-            "ENVIRONMENT",
-            "GCP_PROJECT_ID",
-            "GCP_REGION",
-            "GCP_WEBHOOK_URL",
-            "GMAIL_IMPERSONATE_USER",
-            "GMAIL_TOKEN_DATA",
-            "GOOGLE_DRIVE_FOLDER_EDITAIS",
-            "GOOGLE_SERVICE_ACCOUNT_KEY",
-            "SLACK_BOT_TOKEN_ACCESS",
-            "SLACK_CHANNEL_ACCESS_LOGS",
-            "STRAPI_BASE_URL",
-            "STRAPI_TOKEN",
-        ],
-        "pi_treatment_data_function": [
+        ),
+        "slack-notifier": _ACCESS_PROFILE,
+        "docusign-webhook": _ACCESS_PROFILE,
+        "pi_treatment_data_function": _TREATMENT_DATA_PROFILE,
+        "pi_raw_data_function": _RAW_DATA_PROFILE,
+        "stf-etl-qualtrics": (
+            "SURVEY_ID",
+            "API_URL_BASE",
+            "QUALTRICS_API_TOKEN",
+            "SURVEYCTO_PASSWORD",
+            "SURVEYCTO_SERVER",
+            "SURVEYCTO_USERNAME",
+            "NOME_ARQUIVO_CSV_NO_ZIP",
             "CREDENTIALS",
             "SLACK_BOT_TOKEN",
-        ],
-        "pi_raw_data_function": [
-            "AUTHORIZATION_KEY_BLIP",
+            "SLACK_CHANNEL_FLUENCY",
+            "FORM_ID",
+            "PAVLOVIA_GITLAB_TOKEN",
+        ),
+        "stf-treatment-function": (
             "CREDENTIALS",
             "SLACK_BOT_TOKEN",
-            "SURVEYCTO_PASSWORD",
             "SURVEYCTO_SERVER",
             "SURVEYCTO_USERNAME",
-        ],
-
-        "stf-etl-qualtrics": ["SURVEY_ID",
-                                "API_URL_BASE",
-                                "QUALTRICS_API_TOKEN",
-                                "SURVEYCTO_PASSWORD",
-                                "SURVEYCTO_SERVER",
-                                "SURVEYCTO_USERNAME",
-                                "NOME_ARQUIVO_CSV_NO_ZIP",
-                                "CREDENTIALS",
-                                "SLACK_BOT_TOKEN",
-                                "SLACK_CHANNEL_FLUENCY",
-                                "FORM_ID","PAVLOVIA_GITLAB_TOKEN"
-                            ],
-
-
-        "stf-treatment-function" : [ "CREDENTIALS", "SLACK_BOT_TOKEN"  ,"SURVEYCTO_SERVER",
-                                "SURVEYCTO_USERNAME","SURVEYCTO_PASSWORD"],
-
-        "twilio-functions" : [ "TWILIO_ACCOUNT_SID", "TWILIO_WHATSAPP_NUMBER", "CONTENT_SID", "CREDENTIALS",'TWILIO_AUTH_TOKEN' ],
-
-    
-        "school-register" : [ "GCP_PROJECT_ID",
-                            "GCP_REGION",
-                            "DOCUSIGN_TEMPLATE_SCHOOL_REGISTER",
-                            "DOCUSIGN_ACCOUNT_ID",
-                            "DOCUSIGN_API_BASE_URL",
-                            "DOCUSIGN_BASE_URL",
-                            "BIGQUERY_DATASET_SCHOOL_REGISTER",
-                            "SLACK_CHANNEL_SCHOOL_REGISTER_LOGS",
-                            "CREDENTIALS",
-                            "DOCUSIGN_ACCESS_TOKEN",
-                            "DOCUSIGN_INTEGRATION_KEY",
-                            "DOCUSIGN_USER_ID",
-                            "DOCUSIGN_CLIENT_SECRET", 'DOCUSIGN_SIGNING_RETURN_URL','SIGNING_PROXY_URL'],
-
-        "school-register-manager" : [ "GCP_PROJECT_ID",
-                            "GCP_REGION",
-                            "DOCUSIGN_TEMPLATE_SCHOOL_REGISTER",
-                            "DOCUSIGN_ACCOUNT_ID",
-                            "DOCUSIGN_API_BASE_URL",
-                            "DOCUSIGN_BASE_URL",
-                            "BIGQUERY_DATASET_SCHOOL_REGISTER",
-                            "SLACK_CHANNEL_SCHOOL_REGISTER_LOGS",
-                            "CREDENTIALS",
-                            "DOCUSIGN_ACCESS_TOKEN",
-                            "DOCUSIGN_INTEGRATION_KEY",
-                            "DOCUSIGN_USER_ID",
-                            "DOCUSIGN_CLIENT_SECRET",'DOCUSIGN_SIGNING_RETURN_URL','SIGNING_PROXY_URL']
-
-    } 
+            "SURVEYCTO_PASSWORD",
+        ),
+        "twilio-functions": (
+            "TWILIO_ACCOUNT_SID",
+            "TWILIO_WHATSAPP_NUMBER",
+            "CONTENT_SID",
+            "CREDENTIALS",
+            "TWILIO_AUTH_TOKEN",
+        ),
+        "school-register": _SCHOOL_REGISTER_PROFILE,
+        "school-register-manager": _SCHOOL_REGISTER_PROFILE,
+    }
 
 
     # Mapeamento de variáveis de ambiente para nomes de secrets no Secret Manager
@@ -354,6 +543,17 @@ class EnvLoader:
         "PAVLOVIA_GITLAB_TOKEN": "pavlovia-gitlab-token"  # Typo no nome original
     }
 
+    # Nomes internados para que os lookups nos caches comparem por identidade.
+    # Nomes de variáveis (identificadores literais) já são internados pelo compilador.
+    FUNCTION_ENV_MAP = {sys.intern(fn): names for fn, names in FUNCTION_ENV_MAP.items()}
+    SECRET_NAME_MAP = {
+        sys.intern(key): sys.intern(secret_name)
+        for key, secret_name in SECRET_NAME_MAP.items()
+    }
+
+    # Listas já separadas em secrets e não-secrets (calculadas uma vez por perfil)
+    _FUNCTION_SECRETS, _FUNCTION_NON_SECRETS = _split_by_secrecy(FUNCTION_ENV_MAP)
+
     def __init__(self, config: EnvConfig):
         """
         Initialize EnvLoader.
@@ -365,52 +565,73 @@ class EnvLoader:
         self._env_vars: Dict[str, str] = {}
         self._secrets_cache: Dict[str, str] = {}
         self._secret_client = None
+        self._secrets_loaded_at = time.monotonic()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        # Nomes dos secrets desta função, resolvidos uma única vez
+        self._secret_names: Dict[str, str] = {
+            var_name: self._resolve_secret_name(var_name)
+            for var_name in self._FUNCTION_SECRETS.get(config.function_name, ())
+        }
+        self._required_vars = frozenset(self.FUNCTION_ENV_MAP.get(config.function_name, ()))
 
         # Determinar caminho do YAML
-        if config.yaml_path:
-            self._yaml_path = Path(config.yaml_path)
-        else:
-            # Tentar encontrar o YAML no pacote
-            # __file__ = .../equidade_data_package/config/env_loader.py
-            # parent = .../equidade_data_package/config/
-            # parent.parent = .../equidade_data_package/
-            package_dir = Path(__file__).parent.parent
-            self._yaml_path = package_dir / "env-files" / "env-shared.yaml"
+        self._yaml_path = Path(config.yaml_path) if config.yaml_path else _DEFAULT_YAML_PATH
 
         # Carregar variáveis
         self._load_all()
 
     def _load_all(self):
         """Load all environment variables from YAML and Secret Manager."""
-        # 1. Carregar do YAML (valores não sensíveis)
-        self._load_from_yaml()
+        function_name = self.config.function_name
+        load_secrets = self.config.use_secret_manager and self._FUNCTION_SECRETS.get(function_name)
+
+        if load_secrets and self._FUNCTION_NON_SECRETS.get(function_name):
+            # 1. YAML (valores não sensíveis) em paralelo com 2. Secret Manager
+            # (valores sensíveis); os conjuntos de chaves são disjuntos
+            yaml_thread = threading.Thread(target=self._load_from_yaml)
+            yaml_thread.start()
+            try:
+                self._load_from_secrets()
+            finally:
+                yaml_thread.join()
+        else:
+            # 1. Carregar do YAML (valores não sensíveis)
+            self._load_from_yaml()
 
-        # 2. Carregar do Secret Manager (valores sensíveis)
-        if self.config.use_secret_manager:
-            self._load_from_secrets()
+            # 2. Carregar do Secret Manager (valores sensíveis)
+            if load_secrets:
+                self._load_from_secrets()
 
         # 3. Runtime environment variables têm prioridade máxima
         # (já estão em os.environ, vamos respeitar isso no get())
 
     def _load_from_yaml(self):
         """Load environment variables from YAML file."""
-        if not self._yaml_path.exists():
-            print(f"⚠️  YAML file not found: {self._yaml_path}")
-            print("   Continuing with Secret Manager only...")
+        # Variáveis não-secretas desta função (secrets vêm do Secret Manager)
+        required_vars = self._FUNCTION_NON_SECRETS.get(self.config.function_name, ())
+
+        # Funções que só usam secrets não precisam ler o YAML
+        if not required_vars:
             return
 
         try:
-            with open(self._yaml_path, "r", encoding="utf-8") as f:
-                yaml_data = yaml.safe_load(f) or {}
-
-            # Obter lista de variáveis necessárias para esta função
-            required_vars = self.FUNCTION_ENV_MAP.get(self.config.function_name, [])
+            # _read_yaml stats the file anyway; a missing file surfaces here
+            # instead of costing a separate exists() check
+            yaml_data = _read_yaml(self._yaml_path, required_vars)
+        except FileNotFoundError:
+            logger.warning(
+                "YAML file not found: %s. Continuing with Secret Manager only...",
+                self._yaml_path,
+            )
+            return
+        except Exception as e:
+            logger.warning("Error loading YAML: %s. Continuing with Secret Manager only...", e)
+            return
 
+        try:
             for var_name in required_vars:
-                # Pular secrets (serão carregados do Secret Manager)
-                if self._is_secret_var(var_name):
-                    continue
-
                 # Verificar se está no YAML
                 if var_name in yaml_data:
                     value = yaml_data[var_name]
@@ -418,46 +639,190 @@ class EnvLoader:
                     self._env_vars[var_name] = str(value) if not isinstance(value, str) else value
 
         except Exception as e:
-            print(f"⚠️  Error loading YAML: {e}")
-            print("   Continuing with Secret Manager only...")
+            logger.warning("Error loading YAML: %s. Continuing with Secret Manager only...", e)
 
     def _load_from_secrets(self):
         """Load secrets from GCP Secret Manager."""
         try:
-            from google.cloud import secretmanager
-        except ImportError:
-            print("⚠️  google-cloud-secret-manager not installed")
-            print("   Install with: pip install google-cloud-secret-manager")
-            return
+            required_vars = self._FUNCTION_SECRETS.get(self.config.function_name, ())
 
-        try:
-            if self._secret_client is None:
-                self._secret_client = secretmanager.SecretManagerServiceClient()
-
-            required_vars = self.FUNCTION_ENV_MAP.get(self.config.function_name, [])
+            # (var_name, secret_name) que precisam ir ao Secret Manager
+            pending = []
 
             for var_name in required_vars:
-                if not self._is_secret_var(var_name):
-                    continue
-
                 # Determinar nome do secret
                 secret_name = self._get_secret_name(var_name)
                 if not secret_name:
                     continue
 
-                # Buscar do cache ou Secret Manager
-                if self.config.cache_secrets and secret_name in self._secrets_cache:
-                    secret_value = self._secrets_cache[secret_name]
+                # Buscar do cache (compartilhado no processo) ou Secret Manager
+                cached_value = self._get_cached_secret(secret_name)
+                if cached_value is not None:
+                    self._env_vars[var_name] = cached_value
                 else:
-                    secret_value = self._fetch_secret(secret_name)
-                    if secret_value and self.config.cache_secrets:
-                        self._secrets_cache[secret_name] = secret_value
+                    pending.append((var_name, secret_name))
+
+            # Cada secret distinto é buscado uma vez; as RPCs rodam em paralelo
+            secret_names = list(dict.fromkeys(name for _, name in pending))
+
+            # Secrets ainda válidos no cache em disco dispensam a RPC
+            disk_values = {}
+            if secret_names and self.config.disk_cache_secrets:
+                disk_values = _read_secret_disk_cache(
+                    self.config.project_id, secret_names, self.config.disk_cache_ttl
+                )
+                secret_names = [name for name in secret_names if name not in disk_values]
+
+            if secret_names and self._secret_client is None:
+                self._secret_client = _get_secret_client()
+                if self._secret_client is None:
+                    logger.warning(
+                        "google-cloud-secret-manager not installed. "
+                        "Install with: pip install google-cloud-secret-manager"
+                    )
+                    secret_names = []
+
+            if len(secret_names) > 1:
+                max_workers = min(_MAX_SECRET_FETCH_WORKERS, len(secret_names))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    fetched = executor.map(self._fetch_secret, secret_names)
+                    secret_values = dict(zip(secret_names, fetched))
+            else:
+                secret_values = {name: self._fetch_secret(name) for name in secret_names}
+
+            if self.config.disk_cache_secrets:
+                fetched_values = {name: value for name, value in secret_values.items() if value}
+                if fetched_values:
+                    _write_secret_disk_cache(self.config.project_id, fetched_values)
+                secret_values.update(disk_values)
+
+            for var_name, secret_name in pending:
+                # Ausente quando o cliente não está disponível
+                secret_value = secret_values.get(secret_name)
+                if secret_value and self.config.cache_secrets:
+                    self._secrets_cache[secret_name] = secret_value
+                    with _SECRETS_CACHE_LOCK:
+                        _SECRETS_CACHE[(self.config.project_id, secret_name)] = secret_value
 
                 if secret_value:
                     self._env_vars[var_name] = secret_value
 
         except Exception as e:
-            print(f"⚠️  Error loading secrets: {e}")
+            logger.warning("Error loading secrets: %s", e)
+
+    def _has_missing_secrets(self) -> bool:
+        """Whether a secret of this function failed to load and isn't set in os.environ."""
+        if not self.config.use_secret_manager:
+            return False
+        environ = os.environ
+        return any(
+            secret_name and var_name not in self._env_vars and var_name not in environ
+            for var_name, secret_name in self._secret_names.items()
+        )
+
+    def refresh_stale_secrets(self):
+        """
+        Refresh secrets older than ``config.secret_ttl`` in the background.
+
+        Returns immediately: until the refresh finishes, get() keeps serving
+        the current (stale) values. At most one refresh runs per loader, and
+        a failed refresh keeps the old values until the next TTL expires.
+        """
+        ttl = self.config.secret_ttl
+        if ttl is None or not self.config.use_secret_manager:
+            return
+        if time.monotonic() - self._secrets_loaded_at < ttl:
+            return
+
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_secrets, daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh_secrets(self):
+        """Refetch this loader's secrets and swap the new values in."""
+        try:
+            loaded = {
+                var_name: secret_name
+                for var_name, secret_name in self._secret_names.items()
+                if var_name in self._env_vars
+            }
+            secret_names = list(dict.fromkeys(loaded.values()))
+            if not secret_names:
+                return
+
+            if self._secret_client is None:
+                self._secret_client = _get_secret_client()
+                if self._secret_client is None:
+                    return
+
+            max_workers = min(_MAX_SECRET_FETCH_WORKERS, len(secret_names))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched = executor.map(self._fetch_secret, secret_names)
+                secret_values = {
+                    name: value for name, value in zip(secret_names, fetched) if value
+                }
+
+            if self.config.cache_secrets:
+                self._secrets_cache.update(secret_values)
+                with _SECRETS_CACHE_LOCK:
+                    for secret_name, value in secret_values.items():
+                        _SECRETS_CACHE[(self.config.project_id, secret_name)] = value
+            if self.config.disk_cache_secrets and secret_values:
+                _write_secret_disk_cache(self.config.project_id, secret_values)
+
+            environ = os.environ
+            for var_name, secret_name in loaded.items():
+                value = secret_values.get(secret_name)
+                if value is None:
+                    continue
+                # Atualiza os.environ só onde o valor veio deste loader
+                # (set_environment), não onde o runtime o definiu
+                if environ.get(var_name) == self._env_vars[var_name]:
+                    environ[var_name] = value
+                self._env_vars[var_name] = value
+
+        except Exception as e:
+            logger.warning("Error refreshing secrets: %s", e)
+        finally:
+            self._secrets_loaded_at = time.monotonic()
+
+    def _get_cached_secret(self, secret_name: str) -> Optional[str]:
+        """
+        Get a secret from the process-wide cache (None if missing or caching disabled).
+
+        Args:
+            secret_name: Secret name in Secret Manager
+
+        Returns:
+            Cached secret value or None
+        """
+        if not self.config.cache_secrets:
+            return None
+
+        with _SECRETS_CACHE_LOCK:
+            secret_value = _SECRETS_CACHE.get((self.config.project_id, secret_name))
+
+        if secret_value is not None:
+            self._secrets_cache[secret_name] = secret_value
+        return secret_value
+
+    @classmethod
+    def invalidate_secret(cls, secret_name: str, project_id: Optional[str] = None):
+        """
+        Drop a secret from the process-wide cache (e.g. after rotating it).
+
+        Args:
+            secret_name: Secret name in Secret Manager
+            project_id: GCP project ID. If None, drops the secret for all projects.
+        """
+        with _SECRETS_CACHE_LOCK:
+            for key in list(_SECRETS_CACHE):
+                if key[1] == secret_name and project_id in (None, key[0]):
+                    del _SECRETS_CACHE[key]
 
     def _is_secret_var(self, var_name: str) -> bool:
         """
@@ -469,21 +834,7 @@ class EnvLoader:
         Returns:
             True if variable should come from Secret Manager
         """
-        # Lista de palavras-chave de variáveis sensíveis
-        # Verificamos se CONTÉM (não apenas startswith) para pegar casos como:
-        # - DOCUSIGN_INTEGRATION_KEY (contém "KEY")
-        # - DOCUSIGN_CLIENT_SECRET (contém "SECRET")
-        secret_keywords = [
-            "CREDENTIALS",
-            "TOKEN",
-            "KEY",
-            "SECRET",
-            "PASSWORD",
-            "AUTHORIZATION",
-            "AUTORIZATION",  # Typo no nome original
-        ]
-
-        return any(keyword in var_name for keyword in secret_keywords)
+        return _is_secret_name(var_name)
 
     def _get_secret_name(self, var_name: str) -> Optional[str]:
         """
@@ -495,6 +846,23 @@ class EnvLoader:
         Returns:
             Secret name or None if not mapped
         """
+        # Variáveis desta função já resolvidas no __init__
+        secret_name = self._secret_names.get(var_name)
+        if secret_name is not None:
+            return secret_name
+
+        return self._resolve_secret_name(var_name)
+
+    def _resolve_secret_name(self, var_name: str) -> str:
+        """
+        Map a variable to its secret name (function-specific, shared or kebab-case).
+
+        Args:
+            var_name: Environment variable name
+
+        Returns:
+            Secret name
+        """
         # Tentar com sufixo específico da função primeiro
         key_with_suffix = f"{var_name}_{self.config.function_name}"
         if key_with_suffix in self.SECRET_NAME_MAP:
@@ -505,7 +873,7 @@ class EnvLoader:
             return self.SECRET_NAME_MAP[var_name]
 
         # Fallback: converter para kebab-case
-        return var_name.lower().replace("_", "-")
+        return sys.intern(var_name.lower().replace("_", "-"))
 
     def _fetch_secret(self, secret_name: str) -> Optional[str]:
         """
@@ -522,7 +890,7 @@ class EnvLoader:
             response = self._secret_client.access_secret_version(request={"name": name})
             return response.payload.data.decode("UTF-8")
         except Exception as e:
-            print(f"⚠️  Failed to fetch secret '{secret_name}': {e}")
+            logger.warning("Failed to fetch secret '%s': %s", secret_name, e)
             return None
 
     def get(self, var_name: str, default: Optional[str] = None) -> Optional[str]:
@@ -571,9 +939,9 @@ class EnvLoader:
             return default
 
         try:
-            return json.loads(value)
+            return _json.loads(value)
         except json.JSONDecodeError as e:
-            print(f"⚠️  Failed to parse JSON for '{var_name}': {e}")
+            logger.warning("Failed to parse JSON for '%s': %s", var_name, e)
             return default
 
     def get_int(self, var_name: str, default: Optional[int] = None) -> Optional[int]:
@@ -594,7 +962,7 @@ class EnvLoader:
         try:
             return int(value)
         except ValueError as e:
-            print(f"⚠️  Failed to parse int for '{var_name}': {e}")
+            logger.warning("Failed to parse int for '%s': %s", var_name, e)
             return default
 
     def get_bool(self, var_name: str, default: bool = False) -> bool:
@@ -623,10 +991,13 @@ class EnvLoader:
         This makes them available to the entire application.
         Call this at the start of your Cloud Function.
         """
-        for var_name, value in self._env_vars.items():
-            # Não sobrescrever variáveis já definidas no runtime
-            if var_name not in os.environ:
-                os.environ[var_name] = value
+        # Não sobrescrever variáveis já definidas no runtime
+        environ = os.environ
+        environ.update({
+            var_name: value
+            for var_name, value in self._env_vars.items()
+            if var_name not in environ
+        })
 
     def get_all(self) -> Dict[str, str]:
         """
@@ -636,14 +1007,25 @@ class EnvLoader:
             Dictionary of all loaded variables
         """
         # Combinar loaded vars com os.environ (runtime tem prioridade)
-        result = self._env_vars.copy()
-        required_vars = self.FUNCTION_ENV_MAP.get(self.config.function_name, [])
+        environ = os.environ
+        required_vars = self.FUNCTION_ENV_MAP.get(self.config.function_name, ())
+        overrides = {name: environ[name] for name in required_vars if name in environ}
 
-        for var_name in required_vars:
-            if var_name in os.environ:
-                result[var_name] = os.environ[var_name]
+        return self._env_vars | overrides
 
-        return result
+    def count(self) -> int:
+        """
+        Count the variables get_all() would return, without building the dict.
+
+        Returns:
+            Number of loaded variables, including runtime-only overrides
+        """
+        environ = os.environ
+        env_vars = self._env_vars
+        runtime_only = sum(
+            1 for name in self._required_vars if name in environ and name not in env_vars
+        )
+        return len(env_vars) + runtime_only
 
     def validate(self, required_vars: Optional[list] = None) -> tuple[bool, list]:
         """
@@ -657,12 +1039,22 @@ class EnvLoader:
             Tuple of (is_valid, missing_vars)
         """
         if required_vars is None:
-            required_vars = self.FUNCTION_ENV_MAP.get(self.config.function_name, [])
-
-        missing = []
-        for var_name in required_vars:
-            if self.get(var_name) is None:
-                missing.append(var_name)
+            required_vars = self.FUNCTION_ENV_MAP.get(self.config.function_name, ())
+            required_set = self._required_vars
+        else:
+            required_set = frozenset(required_vars)
+
+        # Caso comum: tudo foi carregado, resolvido com uma diferença de conjuntos
+        not_loaded = required_set.difference(self._env_vars)
+        if not not_loaded:
+            return True, []
+
+        environ = os.environ
+        missing = [
+            var_name
+            for var_name in required_vars
+            if var_name in not_loaded and var_name not in environ
+        ]
 
         return len(missing) == 0, missing
 
@@ -677,6 +1069,47 @@ class EnvLoader:
         )
 
 
+# Loaders built by load_env, keyed by (function_name, project_id, config items)
+_LOAD_ENV_CACHE: "OrderedDict[Tuple[str, str, Tuple[Tuple[str, Any], ...]], EnvLoader]" = OrderedDict()
+_LOAD_ENV_CACHE_MAX_ENTRIES = 16
+_LOAD_ENV_CACHE_LOCK = threading.Lock()
+
+
+def _load_env_cached(
+    function_name: str, project_id: str, config_items: Tuple[Tuple[str, Any], ...]
+) -> EnvLoader:
+    """Build the EnvLoader for a load_env call; memoized per distinct arguments."""
+    key = (function_name, project_id, config_items)
+    with _LOAD_ENV_CACHE_LOCK:
+        loader = _LOAD_ENV_CACHE.get(key)
+        if loader is not None:
+            _LOAD_ENV_CACHE.move_to_end(key)
+            return loader
+
+    config = EnvConfig(
+        function_name=function_name, project_id=project_id, **dict(config_items)
+    )
+    loader = EnvLoader(config)
+
+    # Um loader com secrets faltando (ex.: erro transitório do Secret Manager)
+    # não é memorizado, para a próxima chamada tentar de novo; sem a biblioteca
+    # instalada, tentar de novo não adianta
+    if not loader._has_missing_secrets() or _SECRET_CLIENT_UNAVAILABLE:
+        with _LOAD_ENV_CACHE_LOCK:
+            _LOAD_ENV_CACHE[key] = loader
+            _LOAD_ENV_CACHE.move_to_end(key)
+            if len(_LOAD_ENV_CACHE) > _LOAD_ENV_CACHE_MAX_ENTRIES:
+                _LOAD_ENV_CACHE.popitem(last=False)
+
+    return loader
+
+
+def _clear_load_env_cache():
+    """Drop every memoized load_env loader."""
+    with _LOAD_ENV_CACHE_LOCK:
+        _LOAD_ENV_CACHE.clear()
+
+
 # Convenience function for quick setup
 def load_env(
     function_name: str,
@@ -687,6 +1120,10 @@ def load_env(
     """
     Quick setup for environment loading.
 
+    The loader is memoized per arguments, so warm Cloud Function invocations
+    reuse it without re-reading the YAML or calling Secret Manager. Use
+    load_env.cache_clear() to force a reload (e.g. in tests).
+
     Args:
         function_name: Name of the Cloud Function
         project_id: GCP project ID
@@ -702,10 +1139,14 @@ def load_env(
         env = load_env("equidade-download-data")
         slack_token = env.get("SLACK_BOT_TOKEN")
     """
-    config = EnvConfig(function_name=function_name, project_id=project_id, **kwargs)
-    loader = EnvLoader(config)
+    loader = _load_env_cached(function_name, project_id, tuple(sorted(kwargs.items())))
+    loader.refresh_stale_secrets()
 
+    # Applied on every call so os.environ is right even if it changed meanwhile
     if auto_set:
         loader.set_environment()
 
     return loader
+
+
+load_env.cache_clear = _clear_load_env_cache
@@ -1,6 +1,9 @@
 """BigQuery loader with automatic type inference and schema handling."""
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import os
 import logging
 import numpy as np
@@ -8,29 +11,287 @@ import hashlib
 import time
 import json
 import io
+import re
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
 from google.cloud import bigquery
 
+# xxh3 hashes query text an order of magnitude faster than MD5; the key is not
+# security sensitive, so MD5 is only the fallback when xxhash isn't installed
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# BigQuery Storage Read API streams results as Arrow record batches, much faster
+# than paging through the REST API; fall back to REST when it's not installed
+try:
+    from google.cloud import bigquery_storage
+except ImportError:
+    bigquery_storage = None
+
+
+# Global cache for query results (least recently used entries are evicted)
+_QUERY_CACHE_MAX_ENTRIES = 32
+_query_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# Runs of characters BigQuery doesn't accept in column names (and underscores
+# next to them) collapse into a single underscore
+_COLUMN_NAME_RE = re.compile(r"[^0-9a-zA-Z]+")
+
+# Markers that need rewriting before a string column can be parsed as numbers
+_NUMERIC_CLEANUP_RE = r"R\$|,"
+
+# Arrow-backed nullable dtypes for numeric columns; they convert to Parquet
+# without the masked-array round trip of "Int64"
+_ARROW_INT64 = pd.ArrowDtype(pa.int64())
+_ARROW_FLOAT64 = pd.ArrowDtype(pa.float64())
+
+# Arrow types matching the BigQuery types produced by the type inference
+_BQ_TO_ARROW_TYPES = {
+    "STRING": pa.string(),
+    "INTEGER": pa.int64(),
+    "FLOAT": pa.float64(),
+    "DATETIME": pa.timestamp("us"),
+}
+
+# Loads are bound by BigQuery job latency, so several tables upload at once
+_MAX_PARALLEL_LOADS = 8
+
+# HTTP connection pool sized so concurrent loads reuse connections
+_HTTP_POOL_CONNECTIONS = 16
+_HTTP_POOL_MAXSIZE = 32
+
+# Columns with more non-null values than this are screened on a sample first;
+# if fewer than 90% of the sample parse, the 99% threshold is out of reach
+_INFERENCE_SAMPLE_SIZE = 1000
+_INFERENCE_SAMPLE_MIN_RATIO = 0.9
+
+# Above this many rows a load job beats streaming inserts (see load_incremental)
+_STREAMING_APPEND_MAX_ROWS = 10_000
+_STREAMING_APPEND_CHUNK_SIZE = 1_000
+
+# Failed-load diagnostics (DEBUG only) scan at most this many rows per column
+_DEBUG_SAMPLE_ROWS = 10_000
+_LETTER_RE = re.compile(r"[a-zA-Z]")
+_NON_NUMERIC_CHAR_RE = re.compile(r"[^0-9.\-]")
+
+# Optional on-disk cache shared by processes on the same host (see disk_cache_ttl);
+# one directory per user, only used if it is private to that user
+_QUERY_DISK_CACHE_DIR = Path(tempfile.gettempdir()) / (
+    f"equidade_bq_cache_{os.getuid()}" if hasattr(os, "getuid") else "equidade_bq_cache"
+)
+
+
+def _clean_numeric_strings(series: pd.Series) -> pd.Series:
+    """
+    Prepare a column for pd.to_numeric: drop "R$", use "." as decimal mark, strip.
+
+    The cleanup runs as Arrow compute kernels on one Arrow string array; the
+    replacements only run on columns that contain those markers. Nulls stay
+    null (pd.to_numeric turns them into NaN as before).
+    """
+    values = pa.array(series.astype("string[pyarrow]"))
+    if pc.any(pc.match_substring_regex(values, _NUMERIC_CLEANUP_RE)).as_py():
+        values = pc.replace_substring(pc.replace_substring(values, "R$", ""), ",", ".")
+    values = pc.utf8_trim_whitespace(values)
+    return pd.Series(values.to_numpy(zero_copy_only=False), index=series.index)
+
+
+def _sample_looks_non_numeric(non_null_values: pd.Series) -> bool:
+    """Cheaply reject clearly non-numeric columns by parsing a fixed random sample."""
+    if len(non_null_values) <= _INFERENCE_SAMPLE_SIZE:
+        return False
+
+    sample = non_null_values.sample(_INFERENCE_SAMPLE_SIZE, random_state=0)
+    parsed = pd.to_numeric(_clean_numeric_strings(sample), errors="coerce")
+    return parsed.notna().mean() < _INFERENCE_SAMPLE_MIN_RATIO
+
+
+def _dataframe_to_parquet(
+    df: pd.DataFrame, schema: List[bigquery.SchemaField]
+) -> io.BytesIO:
+    """Serialize a DataFrame to an in-memory Parquet file typed by a BigQuery schema."""
+    arrow_schema = pa.schema(
+        [pa.field(field.name, _BQ_TO_ARROW_TYPES[field.field_type]) for field in schema]
+    )
+    table = pa.Table.from_pandas(df, schema=arrow_schema, preserve_index=False)
+
+    buf = io.BytesIO()
+    pq.write_table(table, buf, compression="snappy")
+    buf.seek(0)
+    return buf
+
+
+def _get_cached_result(query_hash: str) -> Optional[pd.DataFrame]:
+    """Return the in-memory cached result for a query, marking it as recently used."""
+    with _query_cache_lock:
+        df = _query_cache.get(query_hash)
+        if df is not None:
+            _query_cache.move_to_end(query_hash)
+        return df
+
+
+def _cache_result(query_hash: str, df: pd.DataFrame) -> None:
+    """Store a query result in memory, evicting the least recently used entries."""
+    with _query_cache_lock:
+        _query_cache[query_hash] = df
+        _query_cache.move_to_end(query_hash)
+        while len(_query_cache) > _QUERY_CACHE_MAX_ENTRIES:
+            _query_cache.popitem(last=False)
+
+
+def _disk_cache_dir(create: bool) -> Optional[Path]:
+    """
+    Return the disk cache directory if it is safe to use, creating it if asked.
+
+    The directory lives in the shared temp dir, so it is only trusted if it is
+    a real directory (not a symlink) owned by the current user with mode 0700;
+    otherwise another user could read or plant query results.
+    """
+    try:
+        if create:
+            _QUERY_DISK_CACHE_DIR.mkdir(mode=0o700, exist_ok=True)
+        st = _QUERY_DISK_CACHE_DIR.lstat()
+    except FileNotFoundError:
+        return None
+
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or (hasattr(os, "getuid") and st.st_uid != os.getuid())
+        or stat.S_IMODE(st.st_mode) != 0o700
+    ):
+        logging.warning(
+            f"Ignoring BigQuery disk cache: {_QUERY_DISK_CACHE_DIR} is not private to this user"
+        )
+        return None
+    return _QUERY_DISK_CACHE_DIR
+
+
+def _read_disk_cache(query_hash: str, ttl: int) -> Optional[pd.DataFrame]:
+    """Read a query result persisted as Feather if it is younger than ttl seconds."""
+    try:
+        cache_dir = _disk_cache_dir(create=False)
+        if cache_dir is None:
+            return None
+        path = cache_dir / f"{query_hash}.feather"
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        return pd.read_feather(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Ignoring BigQuery disk cache entry {query_hash[:8]}: {str(e)}")
+        return None
+
+
+def _write_disk_cache(query_hash: str, df: pd.DataFrame) -> None:
+    """Persist a query result as Feather (atomic replace)."""
+    tmp_path = None
+    try:
+        cache_dir = _disk_cache_dir(create=True)
+        if cache_dir is None:
+            return
+        path = cache_dir / f"{query_hash}.feather"
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        df.to_feather(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.warning(f"Could not write BigQuery disk cache: {str(e)}")
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=8)
+def _credentials_identity(credentials_key: str) -> str:
+    """The project and service account a credentials key runs queries as."""
+    info = json.loads(credentials_key)
+    return f"{info.get('project_id')}/{info.get('client_email')}"
 
-# Global cache for query results
-_query_cache = {}
+
+def _query_key(sql_query: str) -> str:
+    """Hash a SQL query into a cache key."""
+    data = sql_query.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.md5(data).hexdigest()
+
+
+def _create_bqstorage_client(credentials):
+    """Create a BigQuery Storage read client, or None if the library is missing."""
+    if bigquery_storage is None:
+        return None
+    return bigquery_storage.BigQueryReadClient(credentials=credentials)
+
+
+def _create_client(credentials) -> bigquery.Client:
+    """Create a BigQuery client whose HTTP session keeps a larger connection pool."""
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(
+        pool_connections=_HTTP_POOL_CONNECTIONS, pool_maxsize=_HTTP_POOL_MAXSIZE
+    )
+    session.mount("https://", adapter)
+    return bigquery.Client(
+        credentials=credentials, project=credentials.project_id, _http=session
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_clients(credentials_key: str):
+    """
+    Return the (bigquery.Client, BigQueryReadClient) pair for a credentials key.
+
+    Clients are built once per distinct credentials and reused, so repeated
+    queries keep their OAuth token and pooled HTTP connections.
+    """
+    credentials = service_account.Credentials.from_service_account_info(
+        json.loads(credentials_key),
+        scopes=["https://www.googleapis.com/auth/cloud-platform"],
+    )
+    return _create_client(credentials), _create_bqstorage_client(credentials)
+
+
+def _credentials_key(credentials_json: Optional[Dict]) -> str:
+    """Stable cache key for the given credentials (or GCP_CREDENTIALS if None)."""
+    if credentials_json is None:
+        # The raw env var text is already a stable key; it's parsed once in _get_clients
+        credentials_key = os.getenv("GCP_CREDENTIALS")
+        if credentials_key is None:
+            raise ValueError("GCP_CREDENTIALS environment variable is not set")
+        return credentials_key
+    return json.dumps(credentials_json, sort_keys=True)
 
 
 def query_bigquery(
-    sql_query: str, credentials_json: Optional[Dict] = None
+    sql_query: str,
+    credentials_json: Optional[Dict] = None,
+    disk_cache_ttl: Optional[int] = None,
 ) -> pd.DataFrame:
     """
     Execute a BigQuery query with manual caching implementation.
 
     This function caches query results to avoid redundant API calls for identical queries.
-    The cache key is an MD5 hash of the SQL query string.
+    The cache key is a hash of the SQL query string (xxh3 if available, else MD5). The in-memory cache keeps the
+    most recently used results only.
 
     Args:
         sql_query: The SQL query to execute
         credentials_json: GCP credentials as dictionary. If None, loads from GCP_CREDENTIALS
                          environment variable
+        disk_cache_ttl: If set, results are also persisted as Feather files in a per-user
+                        temp directory and reused by other processes running as the
+                        same project and service account for up to this many seconds
 
     Returns:
         pd.DataFrame: Query results as a DataFrame
@@ -45,46 +306,53 @@ def query_bigquery(
         >>> df2 = query_bigquery("SELECT * FROM dataset.table", credentials)
     """
     # Create hash of query for cache key
-    query_hash = hashlib.md5(sql_query.encode("utf-8")).hexdigest()
+    query_hash = _query_key(sql_query)
 
     # Check if we have this query in cache
-    if query_hash in _query_cache:
+    cached = _get_cached_result(query_hash)
+    if cached is not None:
         logging.info(f"Cache hit for query: {query_hash[:8]}...")
-        return _query_cache[query_hash].copy()  # Return copy to avoid modifications
+        return cached.copy()  # Return copy to avoid modifications
+
+    # The disk cache is shared across processes, so its key also names the
+    # project and service account the query runs as
+    if disk_cache_ttl is not None:
+        identity = _credentials_identity(_credentials_key(credentials_json))
+        disk_hash = _query_key(f"{identity}\n{sql_query}")
+
+        # A freshly deserialized DataFrame is not shared, so no copy is needed
+        df = _read_disk_cache(disk_hash, disk_cache_ttl)
+        if df is not None:
+            logging.info(f"Disk cache hit for query: {query_hash[:8]}...")
+            return df
 
     # If not in cache, execute the query
     start_time = time.time()
 
     try:
-        # If credentials_json is None, load from environment
-        if credentials_json is None:
-            credentials_json = json.loads(os.getenv("GCP_CREDENTIALS"))
-
-        # Create credentials
-        credentials = service_account.Credentials.from_service_account_info(
-            credentials_json, scopes=["https://www.googleapis.com/auth/cloud-platform"]
-        )
-
-        # Create client
-        client = bigquery.Client(
-            credentials=credentials, project=credentials.project_id
-        )
+        # Reuse the clients for these credentials (GCP_CREDENTIALS if None)
+        client, bqstorage_client = _get_clients(_credentials_key(credentials_json))
 
         # Configure job (without timeout_ms)
         job_config = bigquery.QueryJobConfig(
             use_query_cache=True  # Use BigQuery internal cache
         )
 
-        # Execute the query
-        query_job = client.query(sql_query, job_config=job_config)
+        # Execute the query; jobs.query returns small/cached results in the
+        # same round trip instead of insert + poll + fetch
+        rows = client.query_and_wait(sql_query, job_config=job_config)
 
-        # Get the DataFrame
-        df = query_job.to_dataframe()
+        # Get the DataFrame (downloaded through the Storage API when available)
+        df = rows.to_dataframe(
+            bqstorage_client=bqstorage_client, create_bqstorage_client=False
+        )
 
         logging.info(f"BigQuery query took {time.time() - start_time:.2f} seconds")
 
         # Add to cache
-        _query_cache[query_hash] = df.copy()
+        _cache_result(query_hash, df.copy())
+        if disk_cache_ttl is not None:
+            _write_disk_cache(disk_hash, df)
 
         return df
 
@@ -97,7 +365,7 @@ def query_bigquery(
 class ColumnTypes:
     """Data class to store column type configurations."""
 
-    STRING_COLUMNS = {
+    STRING_COLUMNS = frozenset({
         "ID_ONDA",
         "ID_ESCOLA",
         "CO_ENTIDADE",
@@ -112,8 +380,8 @@ class ColumnTypes:
         "id_agente",
         "id",
         "guest_grade",
-    }
-    DATE_COLUMNS = {
+    })
+    DATE_COLUMNS = frozenset({
         "DATA",
         "SubmissionDate",
         "DATA_HORA",
@@ -121,8 +389,8 @@ class ColumnTypes:
         "timeStarted",
         "created",
         "lastUpdated",
-    }
-    ID_INDICATORS = {
+    })
+    ID_INDICATORS = frozenset({
         "id",
         "cod",
         "code",
@@ -133,7 +401,11 @@ class ColumnTypes:
         "CO",
         "ID",
         "COD",
-    }
+    })
+
+
+# Indicators are matched against the lowercased column name in one search
+_ID_INDICATOR_RE = re.compile("|".join(map(re.escape, sorted(ColumnTypes.ID_INDICATORS))))
 
 
 class BigQueryWaveLoader:
@@ -150,9 +422,8 @@ class BigQueryWaveLoader:
         self.credentials = service_account.Credentials.from_service_account_info(
             credentials_json, scopes=["https://www.googleapis.com/auth/cloud-platform"]
         )
-        self.client = bigquery.Client(
-            credentials=self.credentials, project=self.credentials.project_id
-        )
+        self.client = _create_client(self.credentials)
+        self.bqstorage_client = _create_bqstorage_client(self.credentials)
         self.project_id = project_id
         self.column_types = ColumnTypes()
         self._setup_logging()
@@ -176,11 +447,7 @@ class BigQueryWaveLoader:
             bool: True if column appears to be an ID field
         """
         name_lower = column_name.lower()
-        has_id_name = any(
-            indicator in name_lower for indicator in self.column_types.ID_INDICATORS
-        )
-
-        if not has_id_name:
+        if not _ID_INDICATOR_RE.search(name_lower):
             return False
 
         non_null_values = values.dropna()
@@ -188,9 +455,13 @@ class BigQueryWaveLoader:
             return False
 
         try:
-            # Check if values are numeric strings of sufficient length
-            numeric_values = [str(val).replace(".0", "") for val in non_null_values]
-            return all(val.isdigit() and len(val) >= 5 for val in numeric_values)
+            # Check if values are numeric strings of sufficient length. A failing
+            # head sample rejects the column without converting the rest.
+            for chunk in (non_null_values.iloc[:100], non_null_values.iloc[100:]):
+                numeric_values = chunk.astype(str).str.replace(".0", "", regex=False)
+                if not numeric_values.str.fullmatch(r"\d{5,}").all():
+                    return False
+            return True
         except:
             return False
 
@@ -205,12 +476,9 @@ class BigQueryWaveLoader:
             DataFrame with cleaned column names
         """
         df = df.copy()
-        df.columns = (
-            df.columns.str.strip()
-            .str.replace("[^0-9a-zA-Z_]", "_", regex=True)
-            .str.replace("__+", "_", regex=True)
-            .str.rstrip("_")
-        )
+        df.columns = [
+            _COLUMN_NAME_RE.sub("_", column.strip()).rstrip("_") for column in df.columns
+        ]
         return df
 
     def _convert_to_numeric(self, series: pd.Series) -> Tuple[pd.Series, str]:
@@ -252,8 +520,8 @@ class BigQueryWaveLoader:
         """
         Improved type inference that better handles null values for numeric columns
         """
-        df = df.copy()
-        # First standardize all null-like values
+        # First standardize all null-like values (replace returns a new
+        # DataFrame, so the caller's frame is never modified)
         df = df.replace(["", " ", "None", "null", "nan", np.nan], np.nan)
         schema = []
 
@@ -288,32 +556,33 @@ class BigQueryWaveLoader:
 
             # Try numeric conversion with preprocessing
             try:
-                # Clean the values for numeric conversion
-                cleaned_values = (
-                    df[column]
-                    .astype(str)
-                    .str.replace("R$", "", regex=False)
-                    .str.replace(",", ".", regex=False)
-                    .str.strip()
-                )
+                if df[column].dtype.kind in "iuf":
+                    # Already numeric: no string round trip needed
+                    numeric_series = df[column]
+                elif _sample_looks_non_numeric(non_null_values):
+                    # Obviously textual column - skip the full-column conversion
+                    df[column] = df[column].fillna("").astype(str)
+                    schema.append(bigquery.SchemaField(column, "STRING"))
+                    continue
+                else:
+                    # Clean the values for numeric conversion
+                    cleaned_values = _clean_numeric_strings(df[column])
 
-                # Convert to numeric
-                numeric_series = pd.to_numeric(cleaned_values, errors="coerce")
+                    # Convert to numeric
+                    numeric_series = pd.to_numeric(cleaned_values, errors="coerce")
 
                 # If over 90% of non-null values converted successfully, consider it numeric
                 valid_numeric_count = numeric_series.notna().sum()
                 if valid_numeric_count / len(non_null_values) >= 0.99:
-                    # Check if all valid values are integers
-                    valid_values = numeric_series.dropna()
-                    if len(valid_values) > 0 and valid_values.equals(
-                        valid_values.astype(int)
-                    ):
-                        df[column] = numeric_series.astype(
-                            "Int64"
-                        )  # Use nullable integer type
+                    # Check if all valid values are integers. Series.equals also
+                    # compares dtypes, so the former equals(astype(int)) test only
+                    # held for int64 data; check the dtype without copying the column
+                    if valid_numeric_count > 0 and numeric_series.dtype == np.dtype(int):
+                        # Use nullable integer type
+                        df[column] = numeric_series.astype(_ARROW_INT64)
                         schema.append(bigquery.SchemaField(column, "INTEGER"))
                     else:
-                        df[column] = numeric_series
+                        df[column] = numeric_series.astype(_ARROW_FLOAT64)
                         schema.append(bigquery.SchemaField(column, "FLOAT"))
                 else:
                     # Not enough valid numeric values - treat as string
@@ -332,14 +601,12 @@ class BigQueryWaveLoader:
         Load dataframe into BigQuery with enhanced empty string handling
         """
         try:
-            # Make a copy to avoid modifying the original DataFrame
-            df = df.copy()
-
-            # Clean empty values and whitespace in all columns
-            df = df.map(
-                lambda x: np.nan if isinstance(x, str) and x.strip() == "" else x
+            # Clean empty values and whitespace in all columns (a regex replace
+            # runs per column instead of calling a lambda for every cell). This
+            # returns a new DataFrame, so the original is left untouched.
+            df = df.replace(
+                [r"\A\s*\Z", r"\A(?:nan|None|null)\Z"], np.nan, regex=True
             )
-            df = df.replace(["",'', "nan", "None", "null"], np.nan)
 
             # Clean column names
             df = self._clean_column_names(df)
@@ -347,20 +614,9 @@ class BigQueryWaveLoader:
             # Do type inference and conversion
             df, schema = self.infer_and_convert_types(df)
 
-            # Additional safety check after type inference
-            # Ensure no empty strings in any numeric columns
-            for col, field in zip(df.columns, schema):
-                if field.field_type in ["INTEGER", "FLOAT"]:
-                    # Convert numeric types with coercion to handle any remaining issues
-                    df[col] = pd.to_numeric(df[col], errors="coerce")
-
-                    # For INTEGER fields, use pandas nullable integer type
-                    if field.field_type == "INTEGER":
-                        df[col] = df[col].astype("Int64")
-
-                elif field.field_type == "STRING":
-                    # Ensure strings don't have any empty values
-                    df[col] = df[col].fillna("").astype(str)
+            # infer_and_convert_types already returns Arrow-backed numeric columns
+            # and filled string columns, and the Parquet conversion enforces the
+            # schema, so no second coercion pass is needed here
 
             # Log columns and their types before upload for debugging
             column_types = {col: str(df[col].dtype) for col in df.columns}
@@ -370,11 +626,15 @@ class BigQueryWaveLoader:
 
             job_config = bigquery.LoadJobConfig(
                 schema=schema,
+                source_format=bigquery.SourceFormat.PARQUET,
                 write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
             )
 
-            job = self.client.load_table_from_dataframe(
-                df, table_id, job_config=job_config
+            # Convert straight to the Arrow types of the inferred schema instead of
+            # letting load_table_from_dataframe re-detect them column by column
+            buf = _dataframe_to_parquet(df, schema)
+            job = self.client.load_table_from_file(
+                buf, table_id, job_config=job_config
             )
             job.result()
 
@@ -388,15 +648,17 @@ class BigQueryWaveLoader:
                 f"Erro ao carregar {table_name} no dataset {dataset_id}: {str(e)}"
             )
             # Log more details about the error
-            if "Invalid value" in str(e):
+            # (the scan is bounded and only runs when DEBUG logging is enabled)
+            if "Invalid value" in str(e) and self.logger.isEnabledFor(logging.DEBUG):
                 # Try to identify the problematic columns
                 try:
+                    sample_df = df.head(_DEBUG_SAMPLE_ROWS)
                     problematic_cols = []
-                    for col in df.columns:
-                        if df[col].dtype.name.startswith(("float", "Float")):
+                    for col in sample_df.columns:
+                        if pd.api.types.is_float_dtype(sample_df[col]):
                             # Check for any strings in this column
                             has_strings = (
-                                df[col].astype(str).str.contains("[a-zA-Z]").any()
+                                sample_df[col].astype(str).str.contains(_LETTER_RE).any()
                             )
                             if has_strings:
                                 problematic_cols.append(col)
@@ -408,11 +670,11 @@ class BigQueryWaveLoader:
 
                     # Sample the problematic values
                     self.logger.error("Sampling some values that might cause issues:")
-                    for col in df.columns:
-                        if df[col].dtype.name.startswith(("float", "Float")):
+                    for col in sample_df.columns:
+                        if pd.api.types.is_float_dtype(sample_df[col]):
                             # Get some sample non-numeric values
-                            samples = df[
-                                df[col].astype(str).str.contains("[^0-9\.\-]", na=False)
+                            samples = sample_df[
+                                sample_df[col].astype(str).str.contains(_NON_NUMERIC_CHAR_RE, na=False)
                             ][col].head(5)
                             if not samples.empty:
                                 self.logger.error(
@@ -431,8 +693,7 @@ class BigQueryWaveLoader:
         Enhanced safe loading with improved type detection for columns with nulls
         """
         try:
-            # Step 1: Make a copy and clean column names
-            df = df.copy()
+            # Step 1: Clean column names (_clean_column_names works on a copy)
             self.logger.info(f"[safe_load] Input shape: {df.shape}")
             self.logger.info(f"[safe_load] Input dtypes:\n{df.dtypes.to_string()}")
 
@@ -512,17 +773,14 @@ class BigQueryWaveLoader:
                 try:
                     # For 'object' type columns, clean the values
                     if df[column].dtype == "object":
-                        cleaned_values = (
-                            df[column]
-                            .astype(str)
-                            .str.replace("R$", "", regex=False)
-                            .str.replace(",", ".", regex=False)
-                            .str.strip()
-                        )
+                        cleaned_values = _clean_numeric_strings(df[column])
                         numeric_series = pd.to_numeric(cleaned_values, errors="coerce")
+                    elif df[column].dtype.kind in "iuf":
+                        # Already numeric: a plain cast to float64 (no-op for float64)
+                        numeric_series = df[column].astype("float64", copy=False)
                     else:
-                        # Already numeric: normalize to float64 so .equals(astype(int)) comparison
-                        # works regardless of whether input is int64, Int64, float64, etc.
+                        # Other non-object dtypes: normalize to float64 so .equals(astype(int))
+                        # comparison works regardless of whether input is int64, Int64, float64, etc.
                         numeric_series = pd.to_numeric(df[column], errors="coerce")
 
                     # Check if most non-null values could be converted successfully
@@ -557,9 +815,11 @@ class BigQueryWaveLoader:
             self.logger.info(f"[safe_load] Step 3 done — schema inferred for {len(schema)} columns")
 
             # Step 4: Final safety pass — ensure all FLOAT columns are pure float64.
-            for col, field in zip(clean_df.columns, schema):
-                if field.field_type == "FLOAT":
-                    series = clean_df[col]
+            # Only columns whose dtype isn't numeric yet need another conversion
+            type_map = {field.name: field.field_type for field in schema}
+            for col in clean_df.columns:
+                series = clean_df[col]
+                if type_map[col] == "FLOAT" and series.dtype.kind not in "iuf":
                     if series.dtype == object:
                         bad_vals = series[series.notna() & ~pd.to_numeric(series, errors="coerce").notna()]
                         if not bad_vals.empty:
@@ -625,6 +885,16 @@ class BigQueryWaveLoader:
                 self.logger.error(f"[safe_load] Error during diagnosis dump: {debug_e}")
             return False
 
+    def _read_csv(self, file_path: str) -> pd.DataFrame:
+        """
+        Read a CSV with pandas' default C parser.
+
+        The PyArrow engine is not a drop-in replacement here: it rejects
+        short rows (the C parser pads them with NaN) and parses ISO datetime
+        text into timestamps, which would change STRING columns on upload.
+        """
+        return pd.read_csv(file_path)
+
     def process_wave(
         self, wave_number: int, base_path: str, file_mappings: Dict[str, str]
     ) -> Dict[str, bool]:
@@ -641,20 +911,32 @@ class BigQueryWaveLoader:
         """
         dataset_id = f"efm_microdados_onda_{wave_number}"
         wave_path = os.path.join(base_path, str(wave_number))
-        results = {}
 
-        for file_prefix, table_name in file_mappings.items():
-            for ext in [".csv", ".CSV"]:
-                file_path = os.path.join(wave_path, f"{file_prefix}{ext}")
-                if os.path.exists(file_path):
-                    df = pd.read_csv(file_path)
-                    results[table_name] = self.load_table(df, dataset_id, table_name)
-                    break
-            else:
-                self.logger.warning(f"File not found: {file_prefix}[.csv/.CSV]")
-                results[table_name] = False
+        if not file_mappings:
+            return {}
 
-        return results
+        max_workers = min(_MAX_PARALLEL_LOADS, len(file_mappings))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                table_name: executor.submit(
+                    self._load_one, wave_path, file_prefix, table_name, dataset_id
+                )
+                for file_prefix, table_name in file_mappings.items()
+            }
+            return {table_name: future.result() for table_name, future in futures.items()}
+
+    def _load_one(
+        self, wave_path: str, file_prefix: str, table_name: str, dataset_id: str
+    ) -> bool:
+        """Read one wave file and load it into its table."""
+        for ext in [".csv", ".CSV"]:
+            file_path = os.path.join(wave_path, f"{file_prefix}{ext}")
+            if os.path.exists(file_path):
+                df = self._read_csv(file_path)
+                return self.load_table(df, dataset_id, table_name)
+
+        self.logger.warning(f"File not found: {file_prefix}[.csv/.CSV]")
+        return False
 
     def process_with_schools(self, base_path: str) -> Dict[str, bool]:
         """
@@ -684,7 +966,7 @@ class BigQueryWaveLoader:
                 full_path = f"{file_path}{ext}"
                 if os.path.exists(full_path):
                     self.logger.info(f"File found: {full_path}")
-                    df = pd.read_csv(full_path)
+                    df = self._read_csv(full_path)
                     results[table_name] = self.load_table(df, dataset_id, table_name)
                     break
             else:
@@ -693,7 +975,9 @@ class BigQueryWaveLoader:
 
         return results
     
-    def load_incremental(self, df: pd.DataFrame, dataset_id: str, table_name: str) -> bool:
+    def load_incremental(
+        self, df: pd.DataFrame, dataset_id: str, table_name: str, streaming: bool = False
+    ) -> bool:
         """
         Carrega dados de forma incremental (append) para uma tabela do BigQuery.
         Mesma assinatura do load_table, mas faz append em vez de sobrescrever.
@@ -702,6 +986,10 @@ class BigQueryWaveLoader:
             df: DataFrame com os dados a serem carregados
             dataset_id: ID do dataset no BigQuery
             table_name: Nome da tabela
+            streaming: Se True, appends pequenos (até 10 mil linhas) em tabelas existentes
+                usam streaming inserts em vez de um load job. Evita a latência e a cota
+                diária de load jobs, mas as linhas ficam no streaming buffer (sem
+                UPDATE/DELETE por algum tempo) e o streaming é cobrado à parte.
         
         Returns:
             bool: True se o carregamento foi bem-sucedido, False caso contrário
@@ -710,10 +998,9 @@ class BigQueryWaveLoader:
             df = df.copy()
             
             # Limpar nomes das colunas (mesmo processo do load_table)
-            df.columns = df.columns.str.strip()
-            df.columns = df.columns.str.replace('[^0-9a-zA-Z_]', '_', regex=True)
-            df.columns = df.columns.str.replace('__+', '_', regex=True)
-            df.columns = df.columns.str.rstrip('_')
+            df.columns = [
+                _COLUMN_NAME_RE.sub("_", column.strip()).rstrip("_") for column in df.columns
+            ]
 
             self.logger.info(f"Colunas após limpeza: {list(df.columns)}")
             
@@ -721,6 +1008,7 @@ class BigQueryWaveLoader:
             table_id = f"{self.project_id}.{dataset_id}.{table_name}"
             
             # Verificar se a tabela existe para decidir o schema
+            table = None
             try:
                 table = self.client.get_table(table_id)
                 # Tabela existe - usar schema existente
@@ -731,8 +1019,24 @@ class BigQueryWaveLoader:
                 
             except Exception:
                 # Tabela não existe - inferir schema como no load_table
+                table = None
                 df, schema = self.infer_and_convert_types(df)
                 self.logger.info(f"Tabela {table_name} não existe. Criando nova tabela.")
+
+            # Appends pequenos: streaming inserts não criam um load job por chamada
+            if streaming and table is not None and len(df) <= _STREAMING_APPEND_MAX_ROWS:
+                chunk_errors = self.client.insert_rows_from_dataframe(
+                    table, df, chunk_size=_STREAMING_APPEND_CHUNK_SIZE
+                )
+                errors = [error for chunk in chunk_errors for error in chunk]
+                if errors:
+                    self.logger.error(f"Erro no streaming insert em {table_name} "
+                                    f"no dataset {dataset_id}: {errors[:5]}")
+                    return False
+
+                self.logger.info(f"Dados inseridos via streaming na tabela {table_name} "
+                                f"no dataset {dataset_id}! {len(df)} registros adicionados.")
+                return True
             
             # Configurar job de carregamento para APPEND
             job_config = bigquery.LoadJobConfig(
@@ -759,23 +1063,35 @@ class BigQueryWaveLoader:
         """
         Alinha o DataFrame ao schema existente da tabela para garantir compatibilidade.
         """
+        # Agrupar colunas por tipo de destino para converter cada grupo de uma vez
+        columns = set(df.columns)
+        string_cols, int_cols, float_cols, date_cols = [], [], [], []
         for field in schema:
             column_name = field.name
             field_type = field.field_type
             
-            if column_name in df.columns:
-                # Converter coluna existente para o tipo correto baseado no schema
-                if field_type == 'STRING' or column_name in self.string_columns:
-                    df[column_name] = df[column_name].fillna('').astype(str)
-                elif field_type in ['INTEGER', 'INT64']:
-                    df[column_name] = pd.to_numeric(df[column_name], errors='coerce').astype('Int64')
-                elif field_type in ['FLOAT', 'FLOAT64']:
-                    df[column_name] = pd.to_numeric(df[column_name], errors='coerce')
-                elif field_type in ['DATETIME', 'TIMESTAMP'] or column_name in self.date_columns:
-                    try:
-                        df[column_name] = pd.to_datetime(df[column_name], errors='coerce')
-                    except:
-                        df[column_name] = df[column_name].fillna('').astype(str)
+            if column_name not in columns:
+                continue
+            if field_type == 'STRING' or column_name in self.column_types.STRING_COLUMNS:
+                string_cols.append(column_name)
+            elif field_type in ['INTEGER', 'INT64']:
+                int_cols.append(column_name)
+            elif field_type in ['FLOAT', 'FLOAT64']:
+                float_cols.append(column_name)
+            elif field_type in ['DATETIME', 'TIMESTAMP'] or column_name in self.column_types.DATE_COLUMNS:
+                date_cols.append(column_name)
+
+        if string_cols:
+            df[string_cols] = df[string_cols].fillna('').astype(str)
+        if int_cols:
+            df[int_cols] = df[int_cols].apply(pd.to_numeric, errors='coerce').astype(_ARROW_INT64)
+        if float_cols:
+            df[float_cols] = df[float_cols].apply(pd.to_numeric, errors='coerce').astype(_ARROW_FLOAT64)
+        for column_name in date_cols:
+            try:
+                df[column_name] = pd.to_datetime(df[column_name], errors='coerce')
+            except:
+                df[column_name] = df[column_name].fillna('').astype(str)
         
         return df
     
@@ -785,6 +1101,9 @@ class BigQueryWaveLoader:
             try:
                 self.client.close()
                 self.client = None
+                if self.bqstorage_client is not None:
+                    self.bqstorage_client.transport.close()
+                    self.bqstorage_client = None
                 logging.info("Cliente Storage fechado com sucesso")
             except Exception as e:
                 logging.error(f"Erro ao fechar cliente Storage: {str(e)}")
@@ -1,14 +1,218 @@
 """Google Drive utilities for reading files and spreadsheets."""
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import codecs
 import io
+import json
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Union
+import google_auth_httplib2
+import httplib2
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 
+# Downloads are network-bound; this many transfers run at once in download_files
+_MAX_PARALLEL_DOWNLOADS = 8
+
+# Drive accepts at most 100 sub-requests per batch request
+_MAX_BATCH_SIZE = 100
+
+# Export formats for Google Workspace files, by their Drive mimeType
+_EXPORT_MIME_TYPES = {
+    "application/vnd.google-apps.spreadsheet": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ),
+    "application/vnd.google-apps.document": "application/pdf",
+}
+# Overrides used when the caller asks for CSV (force_csv=True)
+_CSV_EXPORT_MIME_TYPES = {
+    "application/vnd.google-apps.spreadsheet": "text/csv",
+}
+
+# Files below this size (and all Google Workspace exports, which Drive caps at
+# 10 MB) are fetched in a single GET instead of through MediaIoBaseDownload
+_SINGLE_GET_MAX_BYTES = 4 * 1024 * 1024
+
+# Largest page files().list returns; fewer pages means fewer round trips
+_MAX_PAGE_SIZE = 1000
+
+# Encoding detection for CSVs: BOMs first (UTF-32 before UTF-16, whose BOM is
+# a prefix of it), then a UTF-8 check of the whole file in chunks of this size
+_UTF8_CHECK_CHUNK_BYTES = 1024 * 1024
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_FALLBACK_ENCODING = "ISO-8859-1"
+
+# pandas' default NA markers, so the PyArrow reader nulls the same cells
+_CSV_NULL_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+# Opt-in cache of downloaded bytes (least recently used entries are evicted),
+# keyed by (file_id, modifiedTime, export format) so edited files are refetched
+_DOWNLOAD_CACHE_MAX_ENTRIES = 32
+_download_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_download_cache_lock = threading.Lock()
+
+# Services built per thread (httplib2 isn't thread-safe), keyed by credentials
+_THREAD_SERVICES = threading.local()
+
+
+@lru_cache(maxsize=4)
+def _get_credentials(credentials_key: str, scopes: tuple):
+    """
+    Return the process-wide service account credentials for a credentials key.
+
+    Parsing the private key is the slow part of building credentials, so it
+    happens once per distinct key and scopes, not once per thread.
+    """
+    return service_account.Credentials.from_service_account_info(
+        json.loads(credentials_key), scopes=list(scopes)
+    )
+
+
+def _get_drive_service(credentials_key: str, scopes: tuple):
+    """
+    Return the calling thread's (service, credentials) pair for a credentials key.
+
+    DriveService instances created with the same credentials on the same
+    thread share one service, skipping the key parse and discovery build.
+    """
+    services = getattr(_THREAD_SERVICES, "services", None)
+    if services is None:
+        services = _THREAD_SERVICES.services = {}
+
+    key = (credentials_key, scopes)
+    if key not in services:
+        logging.info("Iniciando criação do serviço Drive...")
+        credentials = _get_credentials(credentials_key, scopes)
+        services[key] = (build("drive", "v3", credentials=credentials), credentials)
+        logging.info("Serviço Drive construído com sucesso")
+    return services[key]
+
+
+def _get_cached_download(key: tuple) -> Optional[bytes]:
+    """Return the cached bytes of a download, marking them as recently used."""
+    with _download_cache_lock:
+        content = _download_cache.get(key)
+        if content is not None:
+            _download_cache.move_to_end(key)
+        return content
+
+
+def _cache_download(key: tuple, content: bytes) -> None:
+    """Store downloaded bytes, evicting the least recently used entries."""
+    with _download_cache_lock:
+        _download_cache[key] = content
+        _download_cache.move_to_end(key)
+        while len(_download_cache) > _DOWNLOAD_CACHE_MAX_ENTRIES:
+            _download_cache.popitem(last=False)
+
+
+def _detect_encoding(file_buffer: io.BytesIO) -> str:
+    """
+    Pick the encoding of a CSV buffer before it is parsed.
+
+    Files with a BOM use the matching Unicode codec; otherwise UTF-8 is chosen
+    when the whole buffer decodes as UTF-8, else ISO-8859-1 (which accepts any
+    byte). Validating everything up front means the file is parsed only once.
+    """
+    with file_buffer.getbuffer() as view:
+        head = view[:4].tobytes()
+        for bom, encoding in _BOM_ENCODINGS:
+            if head.startswith(bom):
+                return encoding
+
+        # Decode in chunks so the check never holds a full copy of the text
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            for start in range(0, len(view), _UTF8_CHECK_CHUNK_BYTES):
+                decoder.decode(view[start:start + _UTF8_CHECK_CHUNK_BYTES])
+            decoder.decode(b"", final=True)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return _FALLBACK_ENCODING
+
+
+def _skip_long_rows(row) -> str:
+    """invalid_row_handler: skip rows with extra fields, reject short ones."""
+    return "skip" if row.actual_columns > row.expected_columns else "error"
+
+
+def _read_csv_as_strings(
+    file_buffer: io.BytesIO, sep: str, encoding: str
+) -> pd.DataFrame:
+    """
+    Parse a CSV buffer into string columns with the multithreaded PyArrow reader.
+
+    Every column is read as text (no type inference, so leading zeros
+    survive). Rows with too many fields are dropped, like
+    pd.read_csv(on_bad_lines="skip"); a row with too few fields raises
+    ArrowInvalid so the caller can fall back to pandas, which pads it with
+    nulls. Column names come from a first pass over the header; repeated
+    names raise ValueError for the same fallback. Both passes read the
+    downloaded bytes in place, without copying them.
+    """
+    data = pa.py_buffer(file_buffer.getbuffer())
+    read_options = pa_csv.ReadOptions(encoding=encoding)
+    parse_options = pa_csv.ParseOptions(
+        delimiter=sep, invalid_row_handler=_skip_long_rows
+    )
+    with pa_csv.open_csv(
+        pa.BufferReader(data), read_options=read_options, parse_options=parse_options
+    ) as reader:
+        column_names = reader.schema.names
+
+    # pandas renames repeated headers (a, a.1, ...); PyArrow would keep them
+    # as duplicate columns, so leave those files to the pandas parser
+    if len(set(column_names)) != len(column_names):
+        raise ValueError("duplicate column names in CSV header")
+
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.string() for name in column_names},
+        null_values=_CSV_NULL_VALUES,
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(
+        pa.BufferReader(data),
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+    string_dtype = pd.StringDtype("pyarrow")
+    return table.to_pandas(types_mapper={pa.string(): string_dtype}.get)
+
 
 class DriveService:
     """Service for managing Google Drive API connections."""
@@ -22,7 +226,10 @@ class DriveService:
         """
         self.SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
         self.credentials_dict = credentials_dict
+        self._credentials_key = json.dumps(credentials_dict, sort_keys=True)
         self._service = None
+        self._credentials = None
+        self._local = threading.local()
 
     def get_service(self):
         """
@@ -33,17 +240,33 @@ class DriveService:
         """
         if not self._service:
             try:
-                logging.info("Iniciando criação do serviço Drive...")
-                credentials = service_account.Credentials.from_service_account_info(
-                    self.credentials_dict, scopes=self.SCOPES
+                self._service, self._credentials = _get_drive_service(
+                    self._credentials_key, tuple(self.SCOPES)
                 )
-                self._service = build("drive", "v3", credentials=credentials)
-                logging.info("Serviço Drive construído com sucesso")
             except Exception as e:
                 logging.error(f"Erro ao criar serviço Drive: {str(e)}")
                 raise
         return self._service
 
+    def get_thread_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """
+        Get an authorized HTTP object owned by the calling thread.
+
+        httplib2 connections are not thread-safe, so concurrent requests must
+        not share the service's default HTTP object.
+
+        Returns:
+            google_auth_httplib2.AuthorizedHttp: HTTP object for this thread
+        """
+        http = getattr(self._local, "http", None)
+        if http is None:
+            self.get_service()
+            http = google_auth_httplib2.AuthorizedHttp(
+                self._credentials, http=httplib2.Http()
+            )
+            self._local.http = http
+        return http
+
 
 class DataFromDrive:
     """Class for reading and processing files from Google Drive."""
@@ -57,13 +280,24 @@ class DataFromDrive:
         """
         self.drive_service = drive_service
 
-    def download_file(self, file_id: str, force_csv: bool = False) -> io.BytesIO:
+    def download_file(
+        self,
+        file_id: str,
+        force_csv: bool = False,
+        mime_type: Optional[str] = None,
+        cache: bool = False,
+    ) -> io.BytesIO:
         """
         Download a file from Google Drive into memory.
 
         Args:
             file_id: ID of the file in Google Drive
             force_csv: If True, export Google Sheets as CSV instead of Excel
+            mime_type: The file's mimeType, if already known (e.g. from
+                list_files_in_folder); skips the metadata request
+            cache: If True, keeps the bytes in memory and serves later calls
+                from there while the file's modifiedTime is unchanged (each
+                call still makes one metadata request)
 
         Returns:
             io.BytesIO: File contents as a bytes buffer
@@ -71,38 +305,114 @@ class DataFromDrive:
         Raises:
             Exception: If download fails
         """
+        return self._download(file_id, force_csv, mime_type=mime_type, cache=cache)
+
+    def download_files(
+        self, file_ids: List[str], force_csv: bool = False
+    ) -> Dict[str, io.BytesIO]:
+        """
+        Download several files from Google Drive concurrently.
+
+        Args:
+            file_ids: IDs of the files in Google Drive
+            force_csv: If True, export Google Sheets as CSV instead of Excel
+
+        Returns:
+            Dict[str, io.BytesIO]: File contents by file ID, in the order given
+
+        Raises:
+            Exception: If any download fails
+        """
+        file_ids = list(dict.fromkeys(file_ids))
+        if not file_ids:
+            return {}
+
+        # One batched metadata call instead of a mimeType lookup per file
+        # (this also builds the shared service before the workers start)
+        metadata = self.get_files_by_ids(file_ids, fields=["id", "mimeType", "size"])
+
+        def download_one(file_id: str) -> io.BytesIO:
+            return self._download(
+                file_id,
+                force_csv,
+                self.drive_service.get_thread_http(),
+                mime_type=metadata[file_id]["mimeType"],
+                size=metadata[file_id].get("size"),
+            )
+
+        max_workers = min(_MAX_PARALLEL_DOWNLOADS, len(file_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(file_ids, executor.map(download_one, file_ids)))
+
+    def _download(
+        self,
+        file_id: str,
+        force_csv: bool,
+        http=None,
+        mime_type: Optional[str] = None,
+        size: Optional[str] = None,
+        cache: bool = False,
+    ) -> io.BytesIO:
+        """
+        Download one file, optionally over a specific (thread-owned) HTTP object.
+
+        The metadata lookup is skipped when the caller already knows the
+        mimeType and no cache check is needed. Small files and exports come
+        back from a single GET.
+        """
         try:
             service = self.drive_service.get_service()
 
-            # Get file metadata to check type
-            file = service.files().get(fileId=file_id, fields="mimeType").execute()
-            mime_type = file["mimeType"]
-
-            # Special handling for Google Sheets when force_csv is True
-            if force_csv and "spreadsheet" in mime_type:
+            # Get file metadata to check type (and freshness, for the cache)
+            modified_time = None
+            if mime_type is None or cache:
+                file = (
+                    service.files()
+                    .get(fileId=file_id, fields="mimeType, size, modifiedTime")
+                    .execute(http=http)
+                )
+                mime_type = file["mimeType"]
+                size = file.get("size")
+                modified_time = file.get("modifiedTime")
+
+            export_type = (
+                force_csv and _CSV_EXPORT_MIME_TYPES.get(mime_type)
+            ) or _EXPORT_MIME_TYPES.get(mime_type)
+            if export_type is not None:
                 request = service.files().export_media(
-                    fileId=file_id, mimeType="text/csv"
+                    fileId=file_id, mimeType=export_type
                 )
-            # Regular handling for other cases
-            elif "google-apps" in mime_type:
-                if "spreadsheet" in mime_type:
-                    request = service.files().export_media(
-                        fileId=file_id,
-                        mimeType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    )
-                elif "document" in mime_type:
-                    request = service.files().export_media(
-                        fileId=file_id, mimeType="application/pdf"
-                    )
+            elif mime_type.startswith("application/vnd.google-apps."):
+                raise ValueError(f"Tipo de arquivo Google não suportado: {mime_type}")
             else:
                 request = service.files().get_media(fileId=file_id)
 
-            file_buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_buffer, request)
+            cache_key = (file_id, modified_time, export_type)
+            if cache:
+                content = _get_cached_download(cache_key)
+                if content is not None:
+                    logging.info(f"Arquivo {file_id} obtido do cache")
+                    return io.BytesIO(content)
+
+            if http is not None:
+                request.http = http
+
+            # Exports report no size; binary files do (as a string)
+            is_small = export_type is not None or (
+                size is not None and int(size) < _SINGLE_GET_MAX_BYTES
+            )
+            if is_small:
+                file_buffer = io.BytesIO(request.execute())
+            else:
+                file_buffer = io.BytesIO()
+                downloader = MediaIoBaseDownload(file_buffer, request)
 
-            done = False
-            while not done:
-                _, done = downloader.next_chunk()
+                done = False
+                while not done:
+                    _, done = downloader.next_chunk()
+
+            if cache:
+                _cache_download(cache_key, file_buffer.getvalue())
 
             file_buffer.seek(0)
             logging.info(f"Arquivo {file_id} baixado com sucesso")
@@ -111,45 +421,67 @@ class DataFromDrive:
         except Exception as e:
             raise Exception(f"Erro ao baixar arquivo: {str(e)}")
 
-    def read_csv(self, file_id: str, is_sheet: bool = False) -> pd.DataFrame:
+    def read_csv(
+        self,
+        file_id: str,
+        is_sheet: bool = False,
+        use_pyarrow: bool = True,
+        mime_type: Optional[str] = None,
+    ) -> pd.DataFrame:
         """
         Read a CSV file from Google Drive.
 
         Args:
             file_id: ID of the file in Google Drive
             is_sheet: If True, treats the file as a Google Sheet
+            use_pyarrow: If True, parses with the multithreaded PyArrow reader
+                into Arrow-backed string columns; set to False for the
+                single-threaded pandas C parser
+            mime_type: The file's mimeType, if already known; skips the
+                metadata request
 
         Returns:
             pd.DataFrame: DataFrame with the CSV file data
 
         Raises:
-            Exception: If reading fails or no supported encoding works
+            Exception: If reading fails
         """
         try:
-            file_buffer = self.download_file(file_id, force_csv=is_sheet)
-
-            # Try different encodings
-            encodings = ["ISO-8859-1", "utf-8", "latin1"]
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(
-                        file_buffer,
-                        sep=(
-                            ";" if not is_sheet else ","
-                        ),  # Google Sheets exports use comma as separator
-                        encoding=encoding,
-                        dtype="string",
-                        on_bad_lines="skip",
-                    )
-                    logging.info(
-                        f"Arquivo {file_id} lido com sucesso usando encoding {encoding}"
-                    )
-                    return df
-                except UnicodeDecodeError:
-                    file_buffer.seek(0)
-                    continue
+            file_buffer = self.download_file(
+                file_id, force_csv=is_sheet, mime_type=mime_type
+            )
 
-            raise Exception("Could not read file with any supported encoding")
+            # Google Sheets exports use comma as separator
+            sep = ";" if not is_sheet else ","
+
+            def parse(encoding: str) -> pd.DataFrame:
+                if use_pyarrow:
+                    try:
+                        return _read_csv_as_strings(file_buffer, sep, encoding)
+                    except ValueError as e:
+                        # ArrowInvalid (a ValueError), e.g. on invalid UTF-8
+                        # bytes or a row with too few fields, or a header
+                        # with repeated names
+                        logging.info(
+                            f"Leitura PyArrow falhou ({str(e)}), usando parser pandas"
+                        )
+                        file_buffer.seek(0)
+                return pd.read_csv(
+                    file_buffer,
+                    sep=sep,
+                    encoding=encoding,
+                    dtype="string",
+                    on_bad_lines="skip",
+                )
+
+            # Detect the encoding up front instead of trying encodings in turn
+            encoding = _detect_encoding(file_buffer)
+            df = parse(encoding)
+
+            logging.info(
+                f"Arquivo {file_id} lido com sucesso usando encoding {encoding}"
+            )
+            return df
 
         except Exception as e:
             logging.error(f"Erro ao ler CSV: {str(e)}")
@@ -161,6 +493,7 @@ class DataFromDrive:
         sheet_names: List[str],
         column_names: List[str],
         skiprows: int = 4,
+        mime_type: Optional[str] = None,
     ) -> pd.DataFrame:
         """
         Read multiple tabs from an Excel file and concatenate results.
@@ -170,6 +503,8 @@ class DataFromDrive:
             sheet_names: List of sheet names to process
             column_names: List of column names for the DataFrame
             skiprows: Number of rows to skip at the beginning (default: 4)
+            mime_type: The file's mimeType, if already known; skips the
+                metadata request
 
         Returns:
             pd.DataFrame: Concatenated DataFrame with data from all sheets
@@ -178,25 +513,28 @@ class DataFromDrive:
             Exception: If reading fails
         """
         try:
-            file_buffer = self.download_file(file_id)
-            df_concatenado = pd.DataFrame()
-
-            for aba in sheet_names:
-                df_aba = pd.read_excel(
-                    file_buffer,
-                    sheet_name=aba,
-                    skiprows=skiprows,
-                    names=column_names,
-                    dtype="string",
-                )
+            file_buffer = self.download_file(file_id, mime_type=mime_type)
+            frames = []
+
+            # Open the workbook once; read_excel per sheet would re-load it every time
+            with pd.ExcelFile(file_buffer) as workbook:
+                for aba in sheet_names:
+                    df_aba = workbook.parse(
+                        sheet_name=aba,
+                        skiprows=skiprows,
+                        names=column_names,
+                        dtype="string",
+                    )
 
-                df_aba["panel"] = aba
-                if aba == "Internet":
-                    df_aba = df_aba.iloc[:-3]
+                    df_aba["panel"] = aba
+                    if aba == "Internet":
+                        df_aba = df_aba.iloc[:-3]
 
-                df_concatenado = pd.concat([df_concatenado, df_aba])
+                    frames.append(df_aba)
 
-            df_concatenado = df_concatenado.reset_index(drop=True)
+            # Single concat at the end (concatenating inside the loop copies
+            # the accumulated rows on every sheet)
+            df_concatenado = pd.concat(frames, ignore_index=True)
             df_concatenado["panel"] = df_concatenado["panel"].str.lower()
 
             logging.info(
@@ -208,15 +546,20 @@ class DataFromDrive:
             logging.error(f"Erro ao ler abas do Excel: {str(e)}")
             raise
 
-    def list_files_in_folder(
+    def iter_files_in_folder(
         self,
         folder_id: str,
         fields: Optional[List[str]] = None,
-        page_size: int = 100,
+        page_size: int = 1000,
         include_trashed: bool = False,
-    ) -> List[Dict]:
+        all_drives: bool = False,
+    ) -> Iterator[Dict]:
         """
-        List all files in a Google Drive folder.
+        Iterate over the files in a Google Drive folder, one page at a time.
+
+        Files from a page are yielded before the next page is requested, so
+        callers can start working right away and only one page is held in
+        memory.
 
         Args:
             folder_id: ID of the folder in Google Drive
@@ -224,11 +567,14 @@ class DataFromDrive:
                     Default: ["id", "name", "mimeType"]
                     Available: id, name, mimeType, size, createdTime, modifiedTime,
                               owners, parents, webViewLink, etc.
-            page_size: Number of files per page (max 1000)
+                    Heavy properties such as permissions slow every page down;
+                    request them only when needed.
+            page_size: Number of files per page (capped at 1000)
             include_trashed: Whether to include trashed files
+            all_drives: Whether to include items from shared drives
 
-        Returns:
-            List[Dict]: List of file metadata dictionaries
+        Yields:
+            Dict: File metadata dictionary
 
         Raises:
             Exception: If listing fails
@@ -245,7 +591,12 @@ class DataFromDrive:
             if not include_trashed:
                 query += " and trashed = false"
 
-            all_files = []
+            drive_kwargs = (
+                {"supportsAllDrives": True, "includeItemsFromAllDrives": True}
+                if all_drives
+                else {}
+            )
+
             page_token = None
 
             while True:
@@ -253,29 +604,62 @@ class DataFromDrive:
                     service.files()
                     .list(
                         q=query,
-                        pageSize=page_size,
+                        pageSize=min(page_size, _MAX_PAGE_SIZE),
                         fields=fields_str,
                         pageToken=page_token,
+                        **drive_kwargs,
                     )
                     .execute()
                 )
 
-                files = response.get("files", [])
-                all_files.extend(files)
+                yield from response.get("files", [])
 
                 page_token = response.get("nextPageToken")
                 if not page_token:
                     break
 
-            logging.info(
-                f"Listados {len(all_files)} arquivos da pasta {folder_id}"
-            )
-            return all_files
-
         except Exception as e:
             logging.error(f"Erro ao listar arquivos da pasta: {str(e)}")
             raise
 
+    def list_files_in_folder(
+        self,
+        folder_id: str,
+        fields: Optional[List[str]] = None,
+        page_size: int = 1000,
+        include_trashed: bool = False,
+        all_drives: bool = False,
+    ) -> List[Dict]:
+        """
+        List all files in a Google Drive folder.
+
+        Args:
+            folder_id: ID of the folder in Google Drive
+            fields: List of fields to return for each file.
+                    Default: ["id", "name", "mimeType"]
+                    See iter_files_in_folder for the available fields.
+            page_size: Number of files per page (capped at 1000)
+            include_trashed: Whether to include trashed files
+            all_drives: Whether to include items from shared drives
+
+        Returns:
+            List[Dict]: List of file metadata dictionaries
+
+        Raises:
+            Exception: If listing fails
+        """
+        all_files = list(
+            self.iter_files_in_folder(
+                folder_id,
+                fields=fields,
+                page_size=page_size,
+                include_trashed=include_trashed,
+                all_drives=all_drives,
+            )
+        )
+        logging.info(f"Listados {len(all_files)} arquivos da pasta {folder_id}")
+        return all_files
+
     def get_file_by_id(self, file_id: str, fields: Optional[List[str]] = None) -> Dict:
         """
         Get file metadata by its ID.
@@ -310,12 +694,66 @@ class DataFromDrive:
             logging.error(f"Erro ao obter metadados do arquivo: {str(e)}")
             raise
 
+    def get_files_by_ids(
+        self, file_ids: List[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Get metadata for several files using Drive batch requests.
+
+        Up to 100 lookups travel in a single HTTP round trip.
+
+        Args:
+            file_ids: IDs of the files in Google Drive
+            fields: List of fields to return.
+                    Default: ["id", "name", "mimeType", "size", "modifiedTime"]
+
+        Returns:
+            Dict[str, Dict]: File metadata dictionaries by file ID
+
+        Raises:
+            Exception: If fetching any file fails
+        """
+        try:
+            service = self.drive_service.get_service()
+
+            if fields is None:
+                fields = ["id", "name", "mimeType", "size", "modifiedTime"]
+
+            fields_str = ", ".join(fields)
+            file_ids = list(dict.fromkeys(file_ids))
+            results: Dict[str, Dict] = {}
+            errors: List[Exception] = []
+
+            def on_response(request_id, response, exception):
+                if exception is not None:
+                    errors.append(exception)
+                else:
+                    results[request_id] = response
+
+            for start in range(0, len(file_ids), _MAX_BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=on_response)
+                for file_id in file_ids[start:start + _MAX_BATCH_SIZE]:
+                    batch.add(
+                        service.files().get(fileId=file_id, fields=fields_str),
+                        request_id=file_id,
+                    )
+                batch.execute()
+                if errors:
+                    raise errors[0]
+
+            logging.info(f"Metadados de {len(results)} arquivos obtidos com sucesso")
+            return {file_id: results[file_id] for file_id in file_ids}
+
+        except Exception as e:
+            logging.error(f"Erro ao obter metadados dos arquivos: {str(e)}")
+            raise
+
     def list_files_modified_after(
         self,
         folder_id: str,
         modified_after: Union[str, datetime],
         fields: Optional[List[str]] = None,
-        page_size: int = 100,
+        page_size: int = 1000,
     ) -> List[Dict]:
         """
         List files in a folder modified after a specific date.
@@ -328,7 +766,7 @@ class DataFromDrive:
                            - Simple date string (e.g., "2024-01-15")
             fields: List of fields to return for each file.
                     Default: ["id", "name", "mimeType", "modifiedTime"]
-            page_size: Number of files per page (max 1000)
+            page_size: Number of files per page (capped at 1000)
 
         Returns:
             List[Dict]: List of file metadata dictionaries sorted by modifiedTime
@@ -376,7 +814,7 @@ class DataFromDrive:
                     service.files()
                     .list(
                         q=query,
-                        pageSize=page_size,
+                        pageSize=min(page_size, _MAX_PAGE_SIZE),
                         fields=fields_str,
                         orderBy="modifiedTime desc",
                         pageToken=page_token,
@@ -1,12 +1,145 @@
 """Google Cloud Storage utilities for reading and writing data files."""
 
 import pandas as pd
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+import atexit
 import io
+import json
 import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Optional, Union, Any
+from google.auth.transport.requests import AuthorizedSession, Request
 from google.oauth2 import service_account
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from pyarrow.fs import GcsFileSystem
+except ImportError:  # pyarrow built without GCS support
+    GcsFileSystem = None
+
+_GCS_SCOPES = ["https://www.googleapis.com/auth/devstorage.read_write"]
+
+# HTTP connection pool sized for concurrent transfers, retrying dropped connections
+_HTTP_POOL_CONNECTIONS = 16
+_HTTP_POOL_MAXSIZE = 16
+_HTTP_RETRIES = Retry(total=3, backoff_factor=0.3)
+
+# Rebuild the PyArrow filesystem this long before its access token expires
+_TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Downloads are network-bound; this many transfers run at once in download_files
+_MAX_PARALLEL_DOWNLOADS = 8
+
+# zstd level 3 writes ~20% smaller files than snappy at similar read speed
+_PARQUET_COMPRESSION = "zstd"
+_PARQUET_COMPRESSION_LEVEL = 3
+_PARQUET_ROW_GROUP_SIZE = 256_000
+
+# Formats written straight into a resumable upload, flushed in chunks of this
+# size; Excel and JSON writers still go through an in-memory buffer
+_STREAMED_WRITE_TYPES = {"parquet", "csv"}
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# load_data options that read_parquet can push down into the stream
+_PARQUET_STREAM_KWARGS = {"columns", "filters"}
+
+
+@lru_cache(maxsize=8)
+def _get_credentials(credentials_key: str) -> service_account.Credentials:
+    """
+    Return the process-wide service account credentials for a credentials key.
+
+    The private key is parsed once; callers needing other scopes derive a copy
+    with with_scopes, which reuses the parsed key.
+    """
+    return service_account.Credentials.from_service_account_info(
+        json.loads(credentials_key)
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_storage_client(credentials_key: str) -> storage.Client:
+    """
+    Return the process-wide Storage client for a credentials key.
+
+    Clients are shared by every StorageService with the same credentials, so
+    the key parse and the TLS connections are reused across instances. They
+    stay open until interpreter exit.
+    """
+    logging.info("Iniciando criação do cliente Storage...")
+    credentials = _get_credentials(credentials_key)
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(
+        pool_connections=_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=_HTTP_POOL_MAXSIZE,
+        max_retries=_HTTP_RETRIES,
+    )
+    session.mount("https://", adapter)
+    client = storage.Client(credentials=credentials, _http=session)
+    atexit.register(client.close)
+    logging.info("Cliente Storage construído com sucesso")
+    return client
+
+
+def _read_csv(file_buffer: io.BytesIO, use_pyarrow: bool = False, **kwargs):
+    """
+    Read a CSV buffer with the pandas C parser, or opt in to the PyArrow engine.
+
+    The PyArrow engine infers timestamp and date columns, so it is only used
+    with use_pyarrow=True. It runs with on_bad_lines="error": a file with
+    malformed rows, or an option the engine rejects (e.g. sep=None or
+    chunksize), falls back to the C parser, which pads short rows with NaN
+    and skips long ones.
+    """
+    kwargs.setdefault("encoding", "utf-8")
+    if use_pyarrow and "engine" not in kwargs and "on_bad_lines" not in kwargs:
+        try:
+            return pd.read_csv(
+                file_buffer, engine="pyarrow", on_bad_lines="error", **kwargs
+            )
+        except ValueError as e:
+            logging.info(f"Leitura PyArrow falhou ({str(e)}), usando parser pandas")
+            file_buffer.seek(0)
+    kwargs.setdefault("on_bad_lines", "skip")
+    return pd.read_csv(file_buffer, **kwargs)
+
+
+def _read_json(file_buffer: io.BytesIO, **kwargs) -> pd.DataFrame:
+    """
+    Read a JSON buffer, using the multithreaded PyArrow reader for JSON Lines.
+
+    PyArrow only parses newline-delimited JSON, so it handles
+    read_json(lines=True) calls; any other options go to pandas, as do
+    files PyArrow rejects (e.g. a field that mixes numbers and strings).
+    """
+    if kwargs == {"lines": True}:
+        try:
+            return pa_json.read_json(file_buffer).to_pandas()
+        except ValueError as e:
+            logging.info(f"Leitura PyArrow falhou ({str(e)}), usando parser pandas")
+            file_buffer.seek(0)
+    return pd.read_json(file_buffer, **kwargs)
+
+
+def _write_parquet(df: pd.DataFrame, file_buffer: io.BytesIO, **kwargs) -> None:
+    """
+    Write a DataFrame as Parquet, defaulting to zstd compression.
+
+    The compression level only applies to the default codec, so passing
+    another compression (e.g. "snappy") doesn't inherit an invalid level.
+    """
+    if "compression" not in kwargs:
+        kwargs["compression"] = _PARQUET_COMPRESSION
+        kwargs.setdefault("compression_level", _PARQUET_COMPRESSION_LEVEL)
+    kwargs.setdefault("engine", "pyarrow")
+    kwargs.setdefault("row_group_size", _PARQUET_ROW_GROUP_SIZE)
+    df.to_parquet(file_buffer, **kwargs)
 
 
 class StorageService:
@@ -20,7 +153,10 @@ class StorageService:
             credentials_dict: GCP service account credentials as dictionary
         """
         self.credentials_dict = credentials_dict
+        self._credentials_key = json.dumps(credentials_dict, sort_keys=True)
         self._client = None
+        self._pa_fs = None
+        self._pa_fs_expiry = None
 
     def get_client(self) -> storage.Client:
         """
@@ -31,27 +167,58 @@ class StorageService:
         """
         if not self._client:
             try:
-                logging.info("Iniciando criação do cliente Storage...")
-                credentials = service_account.Credentials.from_service_account_info(
-                    self.credentials_dict
-                )
-                self._client = storage.Client(credentials=credentials)
-                logging.info("Cliente Storage construído com sucesso")
+                self._client = _get_storage_client(self._credentials_key)
             except Exception as e:
                 logging.error(f"Erro ao criar cliente Storage: {str(e)}")
                 raise
         return self._client
 
-    def close(self) -> None:
-        """Close the Storage client connection."""
-        if self._client:
+    def get_pa_fs(self) -> Optional["GcsFileSystem"]:
+        """
+        Get or create a PyArrow GCS filesystem for streaming reads.
+
+        PyArrow can't refresh service account credentials itself, so the
+        filesystem is built from a fresh access token and rebuilt shortly
+        before that token expires.
+
+        Returns:
+            Optional[GcsFileSystem]: Authenticated filesystem, or None when
+                pyarrow was built without GCS support
+        """
+        if GcsFileSystem is None:
+            return None
+
+        now = datetime.now(timezone.utc)
+        if self._pa_fs is None or now >= self._pa_fs_expiry - _TOKEN_REFRESH_MARGIN:
             try:
-                self._client.close()
-                self._client = None
-                logging.info("Cliente Storage fechado com sucesso")
+                credentials = _get_credentials(self._credentials_key).with_scopes(
+                    _GCS_SCOPES
+                )
+                credentials.refresh(Request())
+                # google-auth reports expiry as naive UTC
+                expiry = credentials.expiry.replace(tzinfo=timezone.utc)
+                self._pa_fs = GcsFileSystem(
+                    access_token=credentials.token,
+                    credential_token_expiration=expiry,
+                    project_id=self.credentials_dict.get("project_id"),
+                )
+                self._pa_fs_expiry = expiry
             except Exception as e:
-                logging.error(f"Erro ao fechar cliente Storage: {str(e)}")
+                logging.error(f"Erro ao criar sistema de arquivos GCS: {str(e)}")
                 raise
+        return self._pa_fs
+
+    def close(self) -> None:
+        """
+        Release this service's Storage client.
+
+        The underlying client is shared with other StorageService instances,
+        so its connections are kept alive for reuse and only closed at
+        interpreter exit.
+        """
+        if self._client:
+            self._client = None
+            logging.info("Cliente Storage liberado com sucesso")
 
 
 class DataFromStorage:
@@ -66,13 +233,18 @@ class DataFromStorage:
         """
         self.storage_service = storage_service
 
-    def download_file(self, bucket_name: str, blob_path: str) -> io.BytesIO:
+    def download_file(
+        self, bucket_name: str, blob_path: str, verify: bool = True
+    ) -> io.BytesIO:
         """
         Download a file from Google Cloud Storage into memory.
 
         Args:
             bucket_name: Name of the bucket
             blob_path: Path to the file within the bucket
+            verify: If True, checks the download against the blob's CRC32C
+                (MD5 when the google-crc32c C extension is unavailable); set
+                to False to skip hashing for large trusted files
 
         Returns:
             io.BytesIO: File contents as a bytes buffer
@@ -86,7 +258,7 @@ class DataFromStorage:
             blob = bucket.blob(blob_path)
 
             file_buffer = io.BytesIO()
-            blob.download_to_file(file_buffer)
+            blob.download_to_file(file_buffer, checksum="auto" if verify else None)
             file_buffer.seek(0)
 
             return file_buffer
@@ -94,13 +266,62 @@ class DataFromStorage:
         except Exception as e:
             raise Exception(f"Erro ao baixar arquivo: {str(e)}")
 
-    def read_parquet(self, bucket_name: str, blob_path: str) -> pd.DataFrame:
+    def download_files(
+        self, bucket_name: str, blob_paths: List[str], verify: bool = True
+    ) -> Dict[str, io.BytesIO]:
+        """
+        Download several files from Google Cloud Storage into memory concurrently.
+
+        Args:
+            bucket_name: Name of the bucket
+            blob_paths: Paths to the files within the bucket
+            verify: If True, checks each download against the blob's checksum
+
+        Returns:
+            Dict[str, io.BytesIO]: File contents keyed by blob path
+
+        Raises:
+            Exception: If any download fails
+        """
+        try:
+            client = self.storage_service.get_client()
+            bucket = client.bucket(bucket_name)
+            buffers = {blob_path: io.BytesIO() for blob_path in blob_paths}
+
+            transfer_manager.download_many(
+                [(bucket.blob(path), buffer) for path, buffer in buffers.items()],
+                download_kwargs={"checksum": "auto" if verify else None},
+                max_workers=_MAX_PARALLEL_DOWNLOADS,
+                worker_type=transfer_manager.THREAD,
+                raise_exception=True,
+            )
+
+            for buffer in buffers.values():
+                buffer.seek(0)
+            logging.info(f"{len(buffers)} arquivos baixados de gs://{bucket_name}")
+            return buffers
+
+        except Exception as e:
+            raise Exception(f"Erro ao baixar arquivos: {str(e)}")
+
+    def read_parquet(
+        self,
+        bucket_name: str,
+        blob_path: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List] = None,
+    ) -> pd.DataFrame:
         """
         Read a Parquet file from Google Cloud Storage.
 
+        Row groups are streamed from the bucket instead of buffering the whole
+        file first, and only the requested columns/row groups are fetched.
+
         Args:
             bucket_name: Name of the bucket
             blob_path: Path to the file within the bucket
+            columns: Optional list of columns to read
+            filters: Optional row filters, as accepted by pyarrow.parquet.read_table
 
         Returns:
             pd.DataFrame: DataFrame with the Parquet file data
@@ -109,8 +330,18 @@ class DataFromStorage:
             Exception: If reading fails
         """
         try:
-            file_buffer = self.download_file(bucket_name, blob_path)
-            return pd.read_parquet(file_buffer)
+            fs = self.storage_service.get_pa_fs()
+            if fs is None:
+                file_buffer = self.download_file(bucket_name, blob_path)
+                return pd.read_parquet(file_buffer, columns=columns, filters=filters)
+
+            table = pq.read_table(
+                f"{bucket_name}/{blob_path}",
+                filesystem=fs,
+                columns=columns,
+                filters=filters,
+            )
+            return table.to_pandas()
 
         except Exception as e:
             raise Exception(f"Erro ao ler arquivo Parquet: {str(e)}")
@@ -130,7 +361,9 @@ class DataFromStorage:
             blob_path: Path to the file within the bucket
             file_type: Type of file ('parquet', 'csv', 'excel', 'json')
                       If None, will be inferred from extension
-            **kwargs: Additional arguments to pass to specific reader functions
+            **kwargs: Additional arguments to pass to specific reader functions.
+                CSVs are parsed with the C parser; use_pyarrow=True opts in to
+                the PyArrow engine (which infers timestamps and dates)
 
         Returns:
             Union[pd.DataFrame, Dict]: DataFrame or dictionary with loaded data
@@ -145,18 +378,20 @@ class DataFromStorage:
                 file_type = Path(blob_path).suffix.lower().replace(".", "")
 
             file_type = file_type.lower()
+            if file_type == "parquet" and set(kwargs) <= _PARQUET_STREAM_KWARGS:
+                logging.info(f"Carregando arquivo {blob_path} do tipo {file_type}")
+                return self.read_parquet(bucket_name, blob_path, **kwargs)
+
             file_buffer = self.download_file(bucket_name, blob_path)
 
             # Dictionary of read functions for each file type
             readers = {
                 "parquet": lambda buf, **kw: pd.read_parquet(buf, **kw),
-                "csv": lambda buf, **kw: pd.read_csv(
-                    buf, encoding="utf-8", on_bad_lines="skip", **kw
-                ),
+                "csv": _read_csv,
                 "excel": lambda buf, **kw: pd.read_excel(buf, **kw),
                 "xlsx": lambda buf, **kw: pd.read_excel(buf, **kw),
                 "xls": lambda buf, **kw: pd.read_excel(buf, **kw),
-                "json": lambda buf, **kw: pd.read_json(buf, **kw),
+                "json": _read_json,
             }
 
             if file_type not in readers:
@@ -227,7 +462,6 @@ class DataFromStorage:
                 file_type = Path(blob_path).suffix.lower().replace(".", "")
 
             file_type = file_type.lower()
-            file_buffer = io.BytesIO()
 
             # Convert dict to DataFrame if necessary
             if isinstance(data, dict):
@@ -235,7 +469,7 @@ class DataFromStorage:
 
             # Dictionary of write functions for each file type
             writers = {
-                "parquet": lambda df, buf, **kw: df.to_parquet(buf, **kw),
+                "parquet": _write_parquet,
                 "csv": lambda df, buf, **kw: df.to_csv(
                     buf, index=False, encoding="utf-8", **kw
                 ),
@@ -251,6 +485,13 @@ class DataFromStorage:
                 )
 
             logging.info(f"Salvando arquivo {blob_path} do tipo {file_type}")
+            if file_type in _STREAMED_WRITE_TYPES:
+                self._stream_to_blob(
+                    bucket_name, blob_path, writers[file_type], data, **kwargs
+                )
+                return
+
+            file_buffer = io.BytesIO()
             writers[file_type](data, file_buffer, **kwargs)
 
             # Upload file to bucket
@@ -259,3 +500,23 @@ class DataFromStorage:
         except Exception as e:
             logging.error(f"Erro ao salvar dados: {str(e)}")
             raise
+
+    def _stream_to_blob(
+        self, bucket_name: str, blob_path: str, writer, data: pd.DataFrame, **kwargs
+    ) -> None:
+        """
+        Serialize a DataFrame straight into a resumable upload.
+
+        Chunks are sent as the writer fills them, so the serialized file is
+        never held in memory as a whole. If the writer raises, the upload is
+        cancelled instead of committing a partial object.
+        """
+        client = self.storage_service.get_client()
+        blob = client.bucket(bucket_name).blob(blob_path)
+
+        # pandas/pyarrow flush mid-write; flushing a resumable upload isn't allowed
+        with blob.open(
+            "wb", chunk_size=_UPLOAD_CHUNK_SIZE, ignore_flush=True
+        ) as blob_stream:
+            writer(data, blob_stream, **kwargs)
+        logging.info(f"Arquivo salvo com sucesso em gs://{bucket_name}/{blob_path}")
@@ -0,0 +1,44 @@
+"""Hatch build hook that ships a JSON copy of env-shared.yaml in the wheel.
+
+EnvLoader reads the JSON copy when its hash matches the YAML, so Cloud
+Functions skip YAML parsing on cold start.
+"""
+
+import hashlib
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import yaml
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+ENV_YAML = Path("equidade_data_package") / "env-files" / "env-shared.yaml"
+
+
+class EnvYamlBuildHook(BuildHookInterface):
+    """Compile env-shared.yaml to env-shared.json at wheel build time."""
+
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version, build_data):
+        if self.target_name != "wheel":
+            return
+
+        raw = (Path(self.root) / ENV_YAML).read_bytes()
+        compiled = {
+            "source_sha256": hashlib.sha256(raw).hexdigest(),
+            # EnvLoader converts non-string values with str(); default=str
+            # gives the same result for values JSON can't represent
+            "values": yaml.safe_load(raw) or {},
+        }
+
+        self._tmp_dir = tempfile.mkdtemp()
+        json_path = Path(self._tmp_dir) / "env-shared.json"
+        json_path.write_text(json.dumps(compiled, default=str), encoding="utf-8")
+        build_data["force_include"][str(json_path)] = str(ENV_YAML.with_suffix(".json"))
+
+    def finalize(self, version, build_data, artifact_path):
+        tmp_dir = getattr(self, "_tmp_dir", None)
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -5,6 +5,7 @@ Faz git pull antes de fazer push para evitar conflitos.
 """
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Lista de repositórios das Cloud Functions
@@ -19,6 +20,9 @@ REPOS = [
 
 BASE_DIR = Path("/Users/spacejao")
 
+# pull/push são limitados pela rede; processa vários repositórios ao mesmo tempo
+MAX_WORKERS = 8
+
 COMMIT_MSG = """chore: add cache clear step to always fetch latest equidade-data-package
 
 Forces rebuild of dependencies to ensure latest version of equidade-data-package
@@ -29,12 +33,13 @@ is fetched from main branch during Cloud Function deployment.
 Co-Authored-By: Claude Sonnet 4.5 <noreply@anthropic.com>"""
 
 
-def run_git_command(repo_dir: Path, command: list) -> tuple[bool, str]:
-    """Executa um comando git em um repositório."""
+def run_git_command(repo_dir: Path, command: list, stdin: str = None) -> tuple[bool, str]:
+    """Executa um comando git em um repositório (stdin opcional)."""
     try:
         result = subprocess.run(
             command,
             cwd=repo_dir,
+            input=stdin,
             capture_output=True,
             text=True,
             check=False
@@ -45,44 +50,56 @@ def run_git_command(repo_dir: Path, command: list) -> tuple[bool, str]:
 
 
 def has_changes(repo_dir: Path) -> bool:
-    """Verifica se há mudanças no workflow."""
+    """Verifica se há mudanças no workflow em relação ao HEAD.
+
+    diff-index compara só as entradas do índice para o caminho, sem o
+    refresh que `git diff` faz; um arquivo apenas tocado (mtime novo, mesmo
+    conteúdo) pode aparecer como alterado; sync_and_push confirma com
+    `git diff` se o commit falhar.
+    """
     success, output = run_git_command(
         repo_dir,
-        ["git", "diff", "--quiet", ".github/workflows/deploy.yaml"]
+        ["git", "diff-index", "--quiet", "HEAD", "--", ".github/workflows/deploy.yaml"]
     )
     return not success
 
 
-def sync_and_push(repo_dir: Path, repo_name: str) -> bool:
-    """Sincroniza com remote, faz commit e push das mudanças."""
+def sync_and_push(repo_dir: Path, log: list) -> bool:
+    """Sincroniza com remote, faz commit e push das mudanças.
+
+    As mensagens vão para `log` para que a saída de cada repositório não se
+    misture com a dos outros que rodam em paralelo.
+    """
 
     # Pull primeiro para evitar conflitos
-    print(f"   🔄 Sincronizando com remote...")
+    log.append("   🔄 Sincronizando com remote...")
     success, output = run_git_command(repo_dir, ["git", "pull", "origin", "main"])
     if not success and "Couldn't find remote ref" not in output:
-        print(f"   ⚠️  Aviso no pull: {output[:100]}")
+        log.append(f"   ⚠️  Aviso no pull: {output[:100]}")
 
     # Verificar se ainda há mudanças após o pull
     if not has_changes(repo_dir):
-        print(f"   ℹ️  Sem mudanças após sincronização")
+        log.append("   ℹ️  Sem mudanças após sincronização")
         return True
 
-    # Add
-    success, output = run_git_command(
-        repo_dir,
-        ["git", "add", ".github/workflows/deploy.yaml"]
-    )
-    if not success:
-        print(f"   ❌ Erro ao fazer git add: {output}")
-        return False
-
-    # Commit
+    # Commit (passar o caminho ao commit dispensa um `git add` separado;
+    # o arquivo já é rastreado, pois has_changes usa `git diff-index`). A mensagem
+    # vai pelo stdin (-F -), fora do argv e do seu limite de tamanho
     success, output = run_git_command(
         repo_dir,
-        ["git", "commit", "-m", COMMIT_MSG]
+        ["git", "commit", "-F", "-", "--", ".github/workflows/deploy.yaml"],
+        stdin=COMMIT_MSG
     )
     if not success:
-        print(f"   ❌ Erro ao fazer commit: {output}")
+        # Falso positivo do diff-index: `git diff` atualiza o índice e confirma
+        unchanged, _ = run_git_command(
+            repo_dir,
+            ["git", "diff", "--quiet", "HEAD", "--", ".github/workflows/deploy.yaml"]
+        )
+        if unchanged:
+            log.append("   ℹ️  Sem mudanças após sincronização")
+            return True
+        log.append(f"   ❌ Erro ao fazer commit: {output}")
         return False
 
     # Push
@@ -91,48 +108,53 @@ def sync_and_push(repo_dir: Path, repo_name: str) -> bool:
         ["git", "push", "origin", "main"]
     )
     if not success:
-        print(f"   ❌ Erro ao fazer push: {output}")
+        log.append(f"   ❌ Erro ao fazer push: {output}")
         return False
 
     return True
 
 
+def process_repo(repo: str) -> tuple[str, str]:
+    """Processa um repositório. Retorna (log, resultado: updated/skipped/error)."""
+    log = [f"📦 Processando {repo}..."]
+    repo_dir = BASE_DIR / repo
+
+    # Verificar se o repositório existe
+    if not repo_dir.exists():
+        log.append("   ⚠️  Não encontrado, pulando")
+        return "\n".join(log), "skipped"
+
+    # Verificar se há mudanças
+    if not has_changes(repo_dir):
+        log.append("   ℹ️  Sem mudanças no workflow")
+        return "\n".join(log), "skipped"
+
+    # Sincronizar e fazer push
+    if sync_and_push(repo_dir, log):
+        log.append("   ✅ Committed and pushed")
+        return "\n".join(log), "updated"
+
+    log.append("   ❌ Erro ao processar")
+    return "\n".join(log), "error"
+
+
 def main():
     print("🚀 Sincronizando e fazendo commit das mudanças...")
     print()
 
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
-
-    for repo in REPOS:
-        print(f"📦 Processando {repo}...")
-        repo_dir = BASE_DIR / repo
-
-        # Verificar se o repositório existe
-        if not repo_dir.exists():
-            print(f"   ⚠️  Não encontrado, pulando")
-            skipped_count += 1
-            print()
-            continue
-
-        # Verificar se há mudanças
-        if not has_changes(repo_dir):
-            print(f"   ℹ️  Sem mudanças no workflow")
-            skipped_count += 1
-            print()
-            continue
-
-        # Sincronizar e fazer push
-        if sync_and_push(repo_dir, repo):
-            print(f"   ✅ Committed and pushed")
-            updated_count += 1
-        else:
-            print(f"   ❌ Erro ao processar")
-            error_count += 1
+    # executor.map devolve os resultados na ordem de REPOS
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(process_repo, REPOS))
 
+    for log, _ in results:
+        print(log)
         print()
 
+    outcomes = [outcome for _, outcome in results]
+    updated_count = outcomes.count("updated")
+    skipped_count = outcomes.count("skipped")
+    error_count = outcomes.count("error")
+
     print("=" * 60)
     print("🎉 Processo concluído!")
     print(f"   - Repositórios atualizados: {updated_count}")
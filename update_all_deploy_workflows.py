@@ -4,7 +4,13 @@ Script para adicionar clear cache step em todos os workflows de deploy das Cloud
 Garante que sempre pegue a última versão do equidade-data-package.
 """
 
+import mmap
 import os
+import re
+import shutil
+import subprocess
+import tempfile
+import textwrap
 from pathlib import Path
 
 # Lista de repositórios das Cloud Functions (do trigger-deploys.yml)
@@ -23,6 +29,7 @@ REPOS = [
 ]
 
 BASE_DIR = Path("/Users/spacejao")
+GITHUB_ORG = "Instituto-Equidade-info"
 
 # Step a ser adicionado antes do deploy
 CACHE_CLEAR_STEP = """
@@ -34,27 +41,58 @@ CACHE_CLEAR_STEP = """
         echo "Forcing rebuild to fetch latest equidade-data-package from main branch"
 """
 
+CACHE_CLEAR_SENTINEL = b"Clear pip cache and update requirements"
+# Step sem indentação; recebe a indentação do step de deploy na inserção
+_CACHE_CLEAR_STEP_BODY = textwrap.dedent(CACHE_CLEAR_STEP.rstrip()) + "\n"
+
+# Compilado uma vez; captura a indentação do step de deploy
+DEPLOY_STEP_RE = re.compile(r"^( *)- name: Deploy Cloud Function\b", re.MULTILINE)
+
+
+def has_cache_clear_step(workflow_file: Path) -> bool:
+    """Verifica se o workflow já tem o step, sem decodificar o arquivo."""
+    with workflow_file.open("rb") as f:
+        # mmap não aceita arquivos vazios
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(CACHE_CLEAR_SENTINEL) != -1
+
+
 def update_workflow(workflow_file: Path) -> bool:
     """Atualiza um arquivo de workflow adicionando o step de clear cache."""
     try:
-        content = workflow_file.read_text()
-
         # Verificar se já tem o step
-        if "Clear pip cache and update requirements" in content:
+        if has_cache_clear_step(workflow_file):
             return False
 
-        # Encontrar a linha "- name: Deploy Cloud Function" e inserir antes
-        lines = content.split('\n')
-        new_lines = []
+        content = workflow_file.read_text()
 
-        for line in lines:
-            if "- name: Deploy Cloud Function" in line:
-                # Adicionar o novo step antes desta linha
-                new_lines.append(CACHE_CLEAR_STEP.rstrip())
-            new_lines.append(line)
+        # Inserir o step antes da linha "- name: Deploy Cloud Function",
+        # com a mesma indentação dela (uma única passada do regex em C)
+        new_content, count = DEPLOY_STEP_RE.subn(
+            lambda m: textwrap.indent(_CACHE_CLEAR_STEP_BODY, m.group(1)) + m.group(0),
+            content,
+            count=1,
+        )
+        if count == 0:
+            print("   ⚠️  Step de deploy não encontrado")
+            return False
 
-        # Salvar o arquivo atualizado
-        workflow_file.write_text('\n'.join(new_lines))
+        # Escreve num temporário no mesmo diretório; os.replace troca o
+        # arquivo de forma atômica
+        with tempfile.NamedTemporaryFile(
+            "w", dir=workflow_file.parent, delete=False
+        ) as dst:
+            dst.write(new_content)
+
+        try:
+            # NamedTemporaryFile cria com permissão 0600; mantém a do original
+            shutil.copymode(workflow_file, dst.name)
+            os.replace(dst.name, workflow_file)
+        except BaseException:
+            os.unlink(dst.name)
+            raise
         return True
 
     except Exception as e:
@@ -62,6 +100,25 @@ def update_workflow(workflow_file: Path) -> bool:
         return False
 
 
+def clone_repo(repo: str, repo_dir: Path) -> bool:
+    """Clona um repositório ausente só com o último commit."""
+    # --depth=1 traz apenas o HEAD; --filter=blob:none adia o download dos
+    # blobs até o checkout, que só precisa dos da árvore atual
+    result = subprocess.run(
+        [
+            "git", "clone", "--depth=1", "--filter=blob:none",
+            f"git@github.com:{GITHUB_ORG}/{repo}.git", str(repo_dir),
+        ],
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if result.returncode != 0:
+        print(f"   ❌ Erro ao clonar: {result.stderr.strip()[:100]}")
+        return False
+    return True
+
+
 def main():
     print("🚀 Iniciando atualização dos workflows de deploy...")
     print()
@@ -75,9 +132,11 @@ def main():
 
         # Verificar se o repositório existe
         if not repo_dir.exists():
-            print(f"⚠️  {repo} - não encontrado, pulando")
-            skipped_count += 1
-            continue
+            print(f"📥 {repo} - não encontrado, clonando")
+            if not clone_repo(repo, repo_dir):
+                print(f"⚠️  {repo} - clone falhou, pulando")
+                skipped_count += 1
+                continue
 
         # Verificar se o workflow existe
         if not workflow_file.exists():
@@ -86,8 +145,9 @@ def main():
             continue
 
         # Criar backup
+        # copy2 copia os bytes direto no kernel e preserva modo e mtime
         backup_file = workflow_file.with_suffix('.yaml.backup')
-        backup_file.write_text(workflow_file.read_text())
+        shutil.copy2(workflow_file, backup_file)
 
         # Atualizar o workflow
         if update_workflow(workflow_file):